@@ -0,0 +1,385 @@
+"""Memory-mapped NumPy snapshot of results for aggregate statistics.
+
+The snapshot is one ``.npy`` file per column (result id, student, subject,
+semester, department, total marks) in a generation directory under
+``ANALYTICS_DIR``; the ``CURRENT`` file names the live generation. Every
+worker maps the same files read-only, so the arrays are held once in the
+page cache and averages, distributions and percentiles are vectorized
+array operations instead of walks over ORM rows.
+
+Refreshes are incremental: results touched since the snapshot's change-feed
+position (directly, or through their student or subject, whose department
+and semester are denormalized here) are re-read and merged into the arrays,
+which are written out as a new compacted generation and swapped in
+atomically. Change-log entries for other tables do not count: when none of
+these three tables changed, the new generation hard-links the previous
+column files and only moves its feed position. The whole table is only read
+for the first build, when the feed cannot cover the gap, or when the change
+log is disabled (then the snapshot is rebuilt once it is
+``ANALYTICS_REFRESH_SECONDS`` old).
+
+Refreshes never run on the request path. Each process runs a refresher
+thread that tries every ``ANALYTICS_REFRESH_SECONDS``, and only one process
+builds at a time; requests just map the generation ``CURRENT`` names,
+re-reading that file at most as often, and keep serving the previous one
+meanwhile.
+
+``numpy`` is an optional dependency; without it callers fall back to SQL.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+
+from app import models
+from app.config import settings
+from app.core import changes
+from app.core.grading import CompiledPolicy
+from app.core.startup import register_shutdown, register_warmer
+from app.database import engine
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+logger = logging.getLogger("app.analytics")
+
+COLUMNS = {
+    "id": "int64",
+    "student_id": "int64",
+    "subject_id": "int64",
+    "semester": "int16",
+    "department_id": "int32",
+    "total_marks": "float32",
+}
+PERCENTILES = (10, 25, 50, 75, 90)
+_FEED_TABLES = {"results": models.Result.id, "students": models.Result.student_id, "subjects": models.Result.subject_id}
+_CURRENT = "CURRENT"
+_CHUNK = 500
+
+
+class AnalyticsSnapshot(NamedTuple):
+    generation: str
+    through_seq: int
+    built_at: float
+    columns: Dict[str, "np.ndarray"]
+
+    @property
+    def rows(self) -> int:
+        return len(self.columns["id"])
+
+    def select(self, department_id: Optional[int] = None, semester: Optional[int] = None):
+        """Boolean row mask for a cohort, or a full slice when unfiltered."""
+        if department_id is None and semester is None:
+            return slice(None)
+        mask = np.ones(self.rows, dtype=bool)
+        if department_id is not None:
+            mask &= self.columns["department_id"] == department_id
+        if semester is not None:
+            mask &= self.columns["semester"] == semester
+        return mask
+
+
+def available() -> bool:
+    return np is not None and settings.ANALYTICS_ENABLED
+
+
+def _rows_query():
+    # Missing joins become -1/0 so every column stays a plain integer array;
+    # missing marks become NaN.
+    return (
+        select(
+            models.Result.id,
+            func.coalesce(models.Result.student_id, -1),
+            func.coalesce(models.Result.subject_id, -1),
+            func.coalesce(models.Subject.semester, 0),
+            func.coalesce(models.Student.department_id, -1),
+            models.Result.total_marks,
+        )
+        .select_from(models.Result)
+        .outerjoin(models.Subject, models.Subject.id == models.Result.subject_id)
+        .outerjoin(models.Student, models.Student.id == models.Result.student_id)
+    )
+
+
+def _dtype():
+    return np.dtype(list(COLUMNS.items()))
+
+
+def _read_all(conn: Connection):
+    query = _rows_query().order_by(models.Result.id)
+    result = conn.execution_options(yield_per=50_000).execute(query)
+    chunks = [np.array(list(map(tuple, partition)), dtype=_dtype()) for partition in result.partitions()]
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=_dtype())
+
+
+def _read_touched(conn: Connection, touched: Dict[str, List[int]]):
+    chunks = []
+    for table_name, ids in touched.items():
+        column = _FEED_TABLES[table_name]
+        for start in range(0, len(ids), _CHUNK):
+            rows = conn.execute(_rows_query().where(column.in_(ids[start:start + _CHUNK]))).all()
+            if rows:
+                chunks.append(np.array(list(map(tuple, rows)), dtype=_dtype()))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=_dtype())
+
+
+def _touched_ids(conn: Connection, since: int, through: int) -> Dict[str, List[int]]:
+    log = models.ChangeLog
+    touched: Dict[str, List[int]] = {name: [] for name in _FEED_TABLES}
+    rows = conn.execute(
+        select(log.table_name, log.row_id)
+        .where(log.seq > since, log.seq <= through, log.table_name.in_(_FEED_TABLES))
+        .distinct()
+    )
+    for table_name, row_id in rows:
+        touched[table_name].append(row_id)
+    return touched
+
+
+def _merge(base: AnalyticsSnapshot, fresh, touched: Dict[str, List[int]]):
+    """Drop every base row a touched id could affect, then add the re-read rows."""
+    columns = base.columns
+    stale = np.zeros(base.rows, dtype=bool)
+    for table_name, ids in touched.items():
+        if ids:
+            stale |= np.isin(columns[_FEED_TABLES[table_name].key], ids)
+    merged = np.empty(int((~stale).sum()) + len(fresh), dtype=_dtype())
+    keep = len(merged) - len(fresh)
+    for name in COLUMNS:
+        merged[name][:keep] = columns[name][~stale]
+        merged[name][keep:] = fresh[name]
+    # A row can be re-read through more than one touched id.
+    _, first = np.unique(merged["id"], return_index=True)
+    return merged[first]
+
+
+def _read_current() -> Optional[str]:
+    try:
+        with open(os.path.join(settings.ANALYTICS_DIR, _CURRENT), encoding="utf-8") as handle:
+            return handle.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def load(generation: str) -> AnalyticsSnapshot:
+    """Map a generation's column files read-only."""
+    path = os.path.join(settings.ANALYTICS_DIR, generation)
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as handle:
+        meta = json.load(handle)
+    columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in COLUMNS}
+    return AnalyticsSnapshot(generation, meta["through_seq"], meta["built_at"], columns)
+
+
+def _write_generation(rows, through_seq: int, mode: str, base: Optional[AnalyticsSnapshot] = None) -> str:
+    """Publish ``rows`` as the new generation; with ``base``, reuse its column files instead."""
+    directory = settings.ANALYTICS_DIR
+    generation = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{through_seq}"
+    staging = os.path.join(directory, f".{generation}.tmp")
+    os.makedirs(staging)
+    for name in COLUMNS:
+        target = os.path.join(staging, f"{name}.npy")
+        if base is None:
+            np.save(target, np.ascontiguousarray(rows[name]))
+            continue
+        source = os.path.join(directory, base.generation, f"{name}.npy")
+        try:
+            os.link(source, target)
+        except OSError:  # no hard links on this filesystem
+            shutil.copyfile(source, target)
+    built_at = base.built_at if base is not None else time.time()
+    with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as handle:
+        json.dump({"through_seq": through_seq, "built_at": built_at, "rows": len(rows), "mode": mode}, handle)
+    os.rename(staging, os.path.join(directory, generation))
+
+    pointer = os.path.join(directory, f".{_CURRENT}.tmp")
+    with open(pointer, "w", encoding="utf-8") as handle:
+        handle.write(generation)
+    os.replace(pointer, os.path.join(directory, _CURRENT))
+
+    # Keep the previous generation for readers that resolved CURRENT just
+    # before the swap; already-mapped files survive unlinking on POSIX.
+    generations = sorted(
+        name for name in os.listdir(directory) if not name.startswith(".") and name != _CURRENT
+    )
+    for old in generations[:-2]:
+        shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+    return generation
+
+
+_process_lock = threading.Lock()
+
+
+@contextmanager
+def _build_lock(wait: bool):
+    """Hold the cross-process build lock; yields False when busy and not waiting."""
+    if not _process_lock.acquire(blocking=wait):
+        yield False
+        return
+    try:
+        try:
+            import fcntl
+        except ImportError:  # no cross-process lock; builds may race but swaps stay atomic
+            yield True
+            return
+        os.makedirs(settings.ANALYTICS_DIR, exist_ok=True)
+        with open(os.path.join(settings.ANALYTICS_DIR, ".lock"), "w") as handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+    finally:
+        _process_lock.release()
+
+
+def refresh(full: bool = False, wait: bool = True) -> Optional[AnalyticsSnapshot]:
+    """Bring the snapshot up to date and return it.
+
+    Returns None when another process is building and ``wait`` is False.
+    """
+    with _build_lock(wait) as acquired:
+        if not acquired:
+            return None
+        generation = _read_current()
+        base = load(generation) if generation else None
+        with engine.connect() as conn:
+            through = changes.latest_seq(conn)
+            if base is not None and not full:
+                if not settings.CHANGE_LOG_ENABLED:
+                    full = time.time() - base.built_at >= settings.ANALYTICS_REFRESH_SECONDS
+                elif base.through_seq < changes.watermark(conn):
+                    full = True
+                elif base.through_seq >= through:
+                    return base
+            if base is None or full:
+                rows, mode = _read_all(conn), "full"
+            else:
+                touched = _touched_ids(conn, base.through_seq, through)
+                if not any(touched.values()):
+                    # Only other tables changed: same rows, later feed position.
+                    rows, mode = base.columns["id"], "advanced"
+                elif sum(map(len, touched.values())) * 2 > base.rows:
+                    # Re-reading most of the table by id is slower than one scan.
+                    rows, mode = _read_all(conn), "full"
+                else:
+                    rows, mode = _merge(base, _read_touched(conn, touched), touched), "incremental"
+        generation = _write_generation(rows, through, mode, base if mode == "advanced" else None)
+        logger.info("Analytics snapshot %s built (%s, %d rows)", generation, mode, len(rows))
+    snapshot = load(generation)
+    _state["snapshot"] = snapshot
+    return snapshot
+
+
+_state: Dict[str, object] = {"snapshot": None, "checked": 0.0}
+_state_lock = threading.Lock()
+
+
+def current() -> Optional[AnalyticsSnapshot]:
+    """This process's mapping of the live generation; None without numpy or before the first build."""
+    if not available():
+        return None
+    now = time.monotonic()
+    snapshot: Optional[AnalyticsSnapshot] = _state["snapshot"]
+    if snapshot is not None and now - _state["checked"] < settings.ANALYTICS_REFRESH_SECONDS:
+        return snapshot
+    with _state_lock:
+        snapshot = _state["snapshot"]
+        if snapshot is not None and now - _state["checked"] < settings.ANALYTICS_REFRESH_SECONDS:
+            return snapshot
+        try:
+            generation = _read_current()
+            if generation and (snapshot is None or snapshot.generation != generation):
+                snapshot = _state["snapshot"] = load(generation)
+        except (OSError, ValueError):
+            logger.exception("Analytics snapshot unavailable")
+        _state["checked"] = now
+        return snapshot
+
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _refresh_loop() -> None:
+    while True:
+        try:
+            # Another process may be building already; it publishes for everyone.
+            refresh(wait=False)
+        except Exception:
+            logger.exception("Analytics refresh failed")
+        if _stop.wait(settings.ANALYTICS_REFRESH_SECONDS):
+            return
+
+
+def start_refresher() -> None:
+    """Start this process's refresher thread (idempotent)."""
+    global _thread
+    if available() and (_thread is None or not _thread.is_alive()):
+        _stop.clear()
+        _thread = threading.Thread(target=_refresh_loop, name="analytics-refresher", daemon=True)
+        _thread.start()
+
+
+@register_shutdown
+def stop_refresher() -> None:
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=5)
+        _thread = None
+
+
+def cohort_stats(
+    snapshot: AnalyticsSnapshot,
+    policy_for: Callable[[Optional[int]], CompiledPolicy],
+    department_id: Optional[int] = None,
+    semester: Optional[int] = None,
+) -> dict:
+    """Counts, averages, grade distribution and mark percentiles for a cohort."""
+    columns = snapshot.columns
+    rows = snapshot.select(department_id, semester)
+    marks = columns["total_marks"][rows]
+    departments = columns["department_id"][rows]
+
+    points = np.zeros(len(marks))
+    for dept in np.unique(departments):
+        in_dept = departments == dept
+        points[in_dept] = policy_for(int(dept) if dept >= 0 else None).points(marks[in_dept])
+    graded = marks[~np.isnan(marks)]
+    grade_points, counts = np.unique(points, return_counts=True)
+    return {
+        "results": int(len(marks)),
+        "students": int(len(np.unique(columns["student_id"][rows]))),
+        "average_marks": round(float(graded.mean()), 2) if len(graded) else 0.0,
+        "average_gpa": round(float(points.mean()), 2) if len(points) else 0.0,
+        "percentiles": {
+            f"p{p}": round(float(value), 2)
+            for p, value in zip(PERCENTILES, np.percentile(graded, PERCENTILES) if len(graded) else ())
+        },
+        "grade_distribution": {f"{value:.1f}": int(count) for value, count in zip(grade_points, counts)},
+        "as_of_seq": snapshot.through_seq,
+    }
+
+
+@register_warmer
+def warm_analytics() -> None:
+    """Map (building it first if needed) the snapshot before the first request."""
+    if available():
+        if _read_current() is None:
+            refresh()
+        current()
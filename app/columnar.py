@@ -0,0 +1,259 @@
+"""Columnar snapshot exports (Arrow IPC or Parquet) for analytics consumers.
+
+Each export is a directory under ``EXPORTS_DIR`` holding one typed file per
+table plus ``manifest.json`` (schemas, row counts, checksums and the change
+feed range covered). The first export is a full snapshot; later ones carry
+only rows inserted or updated since the previous export, found through the
+change feed, plus a ``<table>.deletes`` file of removed ids. When the feed
+cannot cover the gap (disabled or compacted past the cursor) the export
+falls back to a full snapshot and says so in the manifest.
+
+The feed cursor is taken before any table is read, so rows changed while
+an export runs may show up again in the next one; consumers apply files as
+upserts keyed by ``id``, which makes that harmless.
+
+Arrow IPC files are written uncompressed so readers can memory-map them
+without copying. ``pyarrow`` is an optional dependency.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, select, update
+from sqlalchemy.engine import Connection
+
+from app import models
+from app.config import settings
+from app.core import changes
+
+
+EXPORT_TABLES = {
+    "students": models.Student,
+    "subjects": models.Subject,
+    "results": models.Result,
+    "fees": models.Fee,
+}
+FORMATS = {"arrow": ".arrow", "parquet": ".parquet"}
+CURSOR = "columnar_export"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError("Columnar exports need pyarrow: pip install pyarrow") from exc
+    return pyarrow
+
+
+def arrow_schema(table):
+    """Map a table's SQLAlchemy column types onto an Arrow schema."""
+    pa = _pyarrow()
+    fields = []
+    for column in table.columns:
+        if isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        elif isinstance(column.type, Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type, nullable=not column.primary_key))
+    return pa.schema(fields)
+
+
+class _BatchWriter:
+    """Writes record batches to an Arrow IPC or Parquet file."""
+
+    def __init__(self, path: str, schema, fmt: str):
+        pa = _pyarrow()
+        self.path = path
+        self.rows = 0
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(path, schema)
+            self._write = self._writer.write_batch
+        else:
+            self._sink = pa.OSFile(path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, schema)
+            self._write = self._writer.write_batch
+
+    def write(self, batch) -> None:
+        self._write(batch)
+        self.rows += batch.num_rows
+
+    def close(self) -> None:
+        self._writer.close()
+        sink = getattr(self, "_sink", None)
+        if sink is not None:
+            sink.close()
+
+
+def _batches(conn: Connection, table, schema, ids: Optional[List[int]]) -> Iterator:
+    """Yield typed record batches of ``table`` (only ``ids`` when given)."""
+    pa = _pyarrow()
+    size = settings.EXPORT_BATCH_SIZE
+    names = schema.names
+
+    def to_batch(rows):
+        columns = list(zip(*rows)) if rows else [[] for _ in names]
+        return pa.RecordBatch.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(columns, schema)], schema=schema
+        )
+
+    if ids is None:
+        result = conn.execution_options(yield_per=size).execute(select(table).order_by(table.c.id))
+        for partition in result.partitions(size):
+            yield to_batch(partition)
+        return
+    for start in range(0, len(ids), size):
+        chunk = ids[start:start + size]
+        rows = conn.execute(select(table).where(table.c.id.in_(chunk)).order_by(table.c.id)).all()
+        if rows:
+            yield to_batch(rows)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_cursor(conn: Connection) -> Optional[int]:
+    return conn.execute(
+        select(models.ChangeFeedState.value).where(models.ChangeFeedState.name == CURSOR)
+    ).scalar()
+
+
+def save_cursor(conn: Connection, seq: int) -> None:
+    """Record the feed position the next incremental export starts from."""
+    state = models.ChangeFeedState
+    if conn.execute(update(state).where(state.name == CURSOR).values(value=seq)).rowcount == 0:
+        conn.execute(state.__table__.insert().values(name=CURSOR, value=seq))
+
+
+def _changed_ids(conn: Connection, since: int, through: int) -> Dict[str, Dict[str, List[int]]]:
+    """Latest operation per row in (since, through], split into upserts and deletes."""
+    log = models.ChangeLog
+    latest: Dict[str, Dict[int, str]] = {name: {} for name in EXPORT_TABLES}
+    rows = conn.execute(
+        select(log.table_name, log.row_id, log.op)
+        .where(log.seq > since, log.seq <= through, log.table_name.in_(EXPORT_TABLES))
+        .order_by(log.seq)
+    )
+    for table_name, row_id, op in rows:
+        latest[table_name][row_id] = op
+    return {
+        name: {
+            "upserts": sorted(i for i, op in ops.items() if op != "delete"),
+            "deletes": sorted(i for i, op in ops.items() if op == "delete"),
+        }
+        for name, ops in latest.items()
+    }
+
+
+def _describe(schema) -> List[dict]:
+    return [{"name": field.name, "type": str(field.type)} for field in schema]
+
+
+def export_snapshot(conn: Connection, fmt: str = "arrow", full: bool = False, progress=None) -> dict:
+    """Write one export directory and return its manifest.
+
+    The caller persists ``manifest["through_seq"]`` with ``save_cursor`` once
+    the export is safely on disk.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'; use one of {', '.join(FORMATS)}")
+    pa = _pyarrow()
+
+    since = _read_cursor(conn)
+    through = changes.latest_seq(conn)
+    reason = None
+    if full or since is None:
+        reason = "requested" if full else "first export"
+    elif not settings.CHANGE_LOG_ENABLED:
+        reason = "change log disabled"
+    elif since < changes.watermark(conn):
+        reason = "change log compacted past the last export"
+    incremental = reason is None
+    changed = _changed_ids(conn, since, through) if incremental else None
+
+    created = datetime.utcnow()
+    export_id = created.strftime("%Y%m%dT%H%M%S%fZ")
+    directory = os.path.join(settings.EXPORTS_DIR, export_id)
+    os.makedirs(directory, exist_ok=True)
+
+    files = []
+    for index, (name, model) in enumerate(EXPORT_TABLES.items()):
+        table = model.__table__
+        schema = arrow_schema(table)
+        ids = changed[name]["upserts"] if incremental else None
+        filename = name + FORMATS[fmt]
+        writer = _BatchWriter(os.path.join(directory, filename), schema, fmt)
+        try:
+            for batch in _batches(conn, table, schema, ids):
+                writer.write(batch)
+        finally:
+            writer.close()
+        files.append({
+            "table": name, "kind": "rows", "file": filename, "rows": writer.rows, "schema": _describe(schema),
+        })
+
+        if incremental and changed[name]["deletes"]:
+            deletes_schema = pa.schema([pa.field("id", pa.int64(), nullable=False)])
+            filename = f"{name}.deletes{FORMATS[fmt]}"
+            writer = _BatchWriter(os.path.join(directory, filename), deletes_schema, fmt)
+            try:
+                writer.write(pa.RecordBatch.from_arrays(
+                    [pa.array(changed[name]["deletes"], type=pa.int64())], schema=deletes_schema
+                ))
+            finally:
+                writer.close()
+            files.append({
+                "table": name, "kind": "deletes", "file": filename, "rows": writer.rows,
+                "schema": _describe(deletes_schema),
+            })
+        if progress:
+            progress((index + 1) / len(EXPORT_TABLES), f"Exported {name}")
+
+    for entry in files:
+        path = os.path.join(directory, entry["file"])
+        entry["bytes"] = os.path.getsize(path)
+        entry["sha256"] = _sha256(path)
+
+    manifest = {
+        "export_id": export_id,
+        "created_at": created.isoformat() + "Z",
+        "format": fmt,
+        "mode": "incremental" if incremental else "full",
+        "full_reason": reason,
+        "since_seq": since if incremental else None,
+        "through_seq": through,
+        "files": files,
+    }
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2)
+    return manifest
+
+
+def list_exports() -> List[dict]:
+    """Manifests of every export on disk, newest first."""
+    if not os.path.isdir(settings.EXPORTS_DIR):
+        return []
+    manifests = []
+    for export_id in sorted(os.listdir(settings.EXPORTS_DIR), reverse=True):
+        path = os.path.join(settings.EXPORTS_DIR, export_id, "manifest.json")
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as handle:
+                manifests.append(json.load(handle))
+    return manifests
@@ -13,12 +13,133 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./students.db"
+    # auto: run DDL only when the stored schema fingerprint differs; always; never
+    SCHEMA_MODE: str = "auto"
+    # Connection pool (file databases and PostgreSQL); size it to fit the server's
+    # max_connections divided across workers
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # PostgreSQL only; 0 disables. Job workers use the job timeout instead.
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000
+    DB_JOB_STATEMENT_TIMEOUT_MS: int = 0
+    
+    # Server (serve.py); WORKERS=0 uses one worker per CPU core
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WORKERS: int = 0
+    BACKLOG: int = 2048
+    KEEPALIVE_TIMEOUT: int = 5
+    GRACEFUL_TIMEOUT: int = 30
+    LIMIT_CONCURRENCY: int = 0
+    MAX_REQUESTS: int = 0
+    MAX_REQUESTS_JITTER: int = 0
+    ACCESS_LOG: bool = False
+    # A worker exiting before its startup completed is a failed start: its
+    # replacement waits WORKER_RESPAWN_BACKOFF, doubling up to the max, and the
+    # supervisor gives up after WORKER_MAX_FAILURES failed starts in a row
+    WORKER_RESPAWN_BACKOFF: float = 0.5
+    WORKER_RESPAWN_BACKOFF_MAX: float = 30.0
+    WORKER_MAX_FAILURES: int = 5
+    
+    # Admission control for expensive routes and login throttling
+    ADMISSION_ENABLED: bool = True
+    HEAVY_CONCURRENCY: int = 4
+    HEAVY_QUEUE_SIZE: int = 32
+    HEAVY_QUEUE_TIMEOUT: float = 5.0
+    RETRY_AFTER_SECONDS: int = 2
+    LOGIN_RATE_PER_MINUTE: float = 10.0
+    LOGIN_BURST: int = 5
+    
+    # Cache: "memory" (per-process LRU) or "shared" (mmap shared by all workers)
+    CACHE_BACKEND: str = "memory"
+    CACHE_SHM_PATH: str = ""
+    CACHE_SHM_SLOTS: int = 1024
+    CACHE_SHM_SLOT_SIZE: int = 256 * 1024
+    # Reference data (departments, subjects) snapshot lifetime; 0 = until invalidated
+    REFDATA_TTL: int = 300
+    # How often each process compares its snapshot with the committed version
+    REFDATA_VERSION_CHECK: float = 2.0
+    
+    # Background jobs (local process pool, no broker)
+    JOBS_ENABLED: bool = True
+    JOB_WORKERS: int = 2
+    JOBS_DIR: str = "job_results"
+    JOB_PROGRESS_INTERVAL: float = 0.5
+    # Running jobs touch updated_at this often; recovery fails those silent for JOB_STALE_SECONDS
+    JOB_HEARTBEAT_SECONDS: float = 60.0
+    JOB_STALE_SECONDS: int = 600
+    
+    # Transcript batches (rendered on a separate process pool)
+    TRANSCRIPT_WORKERS: int = 2
+    TRANSCRIPT_BATCH_SIZE: int = 50
+    
+    # Bulk result upload (/results/bulk)
+    RESULTS_BULK_MAX_ROWS: int = 10_000
+    
+    # CSV/NDJSON imports (/imports); one transaction per chunk
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 1000
+    
+    # Semester rollover (/students/rollover); one transaction per chunk
+    FINAL_SEMESTER: int = 8
+    ROLLOVER_CHUNK_SIZE: int = 1000
+    
+    # Result publication (/results/publish); cached documents also expire after the TTL,
+    # which bounds how long other workers' in-process caches can lag a republish
+    PUBLICATION_BATCH_SIZE: int = 500
+    PUBLICATION_CACHE_SIZE: int = 10_000
+    PUBLICATION_CACHE_TTL: int = 300
+    
+    # Change feed (/changes); entries older than the retention are compacted away
+    CHANGE_LOG_ENABLED: bool = True
+    CHANGE_LOG_RETENTION_DAYS: int = 30
+    CHANGE_FEED_PAGE_SIZE: int = 1000
+    
+    # Columnar analytics exports (needs pyarrow)
+    EXPORTS_DIR: str = "exports"
+    EXPORT_BATCH_SIZE: int = 50_000
+    
+    # Audit trail (write-behind: buffered per process, flushed in batches)
+    AUDIT_ENABLED: bool = True
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL: float = 1.0
+    AUDIT_MAX_PENDING: int = 100_000
+    AUDIT_PAGE_SIZE: int = 500
+    
+    # Analytics snapshot (mmap'd NumPy arrays, needs numpy); a background thread per worker
+    # refreshes it, and requests re-read the live generation, at most this often
+    ANALYTICS_ENABLED: bool = True
+    ANALYTICS_DIR: str = "analytics"
+    ANALYTICS_REFRESH_SECONDS: float = 30.0
+    
+    # Dashboard history (/dashboard/history); every worker runs the snapshotter, one writes each tick
+    DASHBOARD_HISTORY_ENABLED: bool = True
+    DASHBOARD_SNAPSHOT_INTERVAL: int = 3600
+    DASHBOARD_HISTORY_RETENTION_DAYS: int = 730
+    DASHBOARD_HISTORY_MAX_POINTS: int = 5000
+    
+    # Startup
+    WARMUP_ENABLED: bool = True
+    WARMUP_CONNECTIONS: int = 2
     
     # Security
     SECRET_KEY: str = "your-super-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Observability
+    METRICS_ENABLED: bool = True
+    PROFILER_ENABLED: bool = False
+    PROFILER_HISTORY: int = 200
+    N_PLUS_ONE_THRESHOLD: int = 5
+    SLOW_QUERY_MS: float = 100.0
+    SLOW_QUERY_LOG: str = "slow_queries.log"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 5 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS: int = 3
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
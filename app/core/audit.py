@@ -0,0 +1,215 @@
+"""Write-behind audit trail of who changed marks, fees, clearance, grading policies and semesters.
+
+Session events turn each committed change to an audited table into a compact
+event (actor, action, entity, id, changed fields) and append it to an
+in-process buffer, so nothing extra is written on the request path. A
+writer thread flushes the buffer with multi-row INSERTs of up to
+``AUDIT_BATCH_SIZE`` events whenever a batch fills or ``AUDIT_FLUSH_INTERVAL``
+elapses, and the buffer is drained on shutdown. Events are buffered only once
+their transaction commits, so rolled-back changes are never audited; a hard
+crash can lose the last interval's events.
+
+The actor is the authenticated user's email, which ``get_current_user``
+stores on the request session. Writes that bypass the ORM call ``record``.
+"""
+import atexit
+import json
+import logging
+import threading
+from collections import deque
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.core.metrics import registry
+from app.core.startup import register_shutdown
+from app.database import SessionLocal, engine
+
+
+logger = logging.getLogger("app.audit")
+
+AUDITED = {
+    model.__tablename__: model
+    for model in (
+        models.Result,
+        models.Fee,
+        models.Clearance,
+        models.GradingPolicy,
+        models.SemesterRollover,
+    )
+}
+_AUDITED_TYPES = tuple(AUDITED.values())
+
+AUDIT_WRITTEN = registry.counter("audit_events_written_total", "Audit events persisted by this process.")
+AUDIT_DROPPED = registry.counter(
+    "audit_events_dropped_total", "Audit events discarded because the buffer hit AUDIT_MAX_PENDING."
+)
+AUDIT_PENDING = registry.gauge("audit_events_pending", "Audit events buffered in this process, not yet written.")
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _changes(obj, op: str) -> dict:
+    """Changed columns as ``{name: [old, new]}`` for updates, loaded values otherwise."""
+    state = inspect(obj)
+    if op == "update":
+        changed = {}
+        for attr in state.mapper.column_attrs:
+            history = state.attrs[attr.key].history
+            if history.added or history.deleted:
+                changed[attr.key] = [
+                    history.deleted[0] if history.deleted else None,
+                    history.added[0] if history.added else None,
+                ]
+        return changed
+    # Read the instance dict directly: deleted rows cannot lazy-load.
+    return {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict}
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect(session: Session, flush_context) -> None:
+    if not settings.AUDIT_ENABLED:
+        return
+    actor = session.info.get("actor")
+    now = datetime.utcnow()
+    events = session.info.setdefault("audit_events", [])
+    for op, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            if not isinstance(obj, _AUDITED_TYPES):
+                continue
+            changes = _changes(obj, op)
+            if op == "update" and not changes:
+                continue
+            events.append((now, actor, op, obj.__tablename__, obj.id, changes))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _enqueue_committed(session: Session) -> None:
+    events = session.info.pop("audit_events", None)
+    if events:
+        _enqueue(events)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop("audit_events", None)
+
+
+def record(actor: Optional[str], action: str, entity: str, rows: Iterable[dict]) -> None:
+    """Audit rows written outside the ORM; call after their transaction commits."""
+    if not settings.AUDIT_ENABLED:
+        return
+    now = datetime.utcnow()
+    _enqueue([(now, actor, action, entity, row["id"], row) for row in rows])
+
+
+_buffer: deque = deque()
+_buffer_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_thread_lock = threading.Lock()
+_wakeup = threading.Event()
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _enqueue(events: List[tuple]) -> None:
+    with _buffer_lock:
+        room = max(settings.AUDIT_MAX_PENDING - len(_buffer), 0)
+        if len(events) > room:
+            AUDIT_DROPPED.inc(amount=len(events) - room)
+            logger.warning("Audit buffer full; dropped %d events", len(events) - room)
+            events = events[:room]
+        _buffer.extend(events)
+        full = len(_buffer) >= settings.AUDIT_BATCH_SIZE
+    _ensure_writer()
+    if full:
+        _wakeup.set()
+
+
+def _row(item: tuple) -> dict:
+    occurred_at, actor, action, entity, entity_id, changes = item
+    return {
+        "occurred_at": occurred_at,
+        "actor": actor,
+        "action": action,
+        "entity": entity,
+        "entity_id": entity_id,
+        "changes": json.dumps(changes, default=_json_default, separators=(",", ":")),
+    }
+
+
+def flush() -> int:
+    """Write every buffered event now; returns how many were written."""
+    written = 0
+    with _flush_lock:
+        while True:
+            with _buffer_lock:
+                batch = [_buffer.popleft() for _ in range(min(len(_buffer), settings.AUDIT_BATCH_SIZE))]
+            if not batch:
+                return written
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(models.AuditEvent).values([_row(item) for item in batch]))
+            except Exception:
+                # Put the batch back in order so the next attempt retries it.
+                with _buffer_lock:
+                    _buffer.extendleft(reversed(batch))
+                raise
+            written += len(batch)
+            AUDIT_WRITTEN.inc(amount=len(batch))
+
+
+def _writer_loop() -> None:
+    while not _stop.is_set():
+        _wakeup.wait(settings.AUDIT_FLUSH_INTERVAL)
+        _wakeup.clear()
+        try:
+            flush()
+        except Exception:
+            logger.exception("Audit flush failed; retrying in %ss", settings.AUDIT_FLUSH_INTERVAL)
+            _stop.wait(settings.AUDIT_FLUSH_INTERVAL)
+
+
+def _ensure_writer() -> None:
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _stop.clear()
+            _thread = threading.Thread(target=_writer_loop, name="audit-writer", daemon=True)
+            _thread.start()
+
+
+@register_shutdown
+def drain() -> None:
+    """Stop the writer and persist whatever is still buffered."""
+    global _thread
+    _stop.set()
+    _wakeup.set()
+    if _thread is not None:
+        _thread.join(timeout=10)
+        _thread = None
+    try:
+        flush()
+    except Exception:
+        logger.exception("Audit drain failed; %d events lost", len(_buffer))
+
+
+# Processes without the app lifespan (job workers, scripts) drain at exit.
+atexit.register(drain)
+
+
+def _pending() -> None:
+    AUDIT_PENDING.set((), len(_buffer))
+
+
+registry.add_collector(_pending)
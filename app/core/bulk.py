@@ -0,0 +1,47 @@
+"""Set-based writes shared by bulk endpoints and imports.
+
+``upsert`` issues ``INSERT ... ON CONFLICT (...) DO UPDATE ... RETURNING`` as
+multi-row statements, so a whole sheet costs a few round trips instead of one
+commit per row. SQLite (3.35+) and PostgreSQL support it; the conflict
+columns must carry a unique index or constraint.
+"""
+from typing import Iterator, List, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.engine import Connection, Row
+
+# SQLite caps bound parameters per statement at 32766; stay well below it.
+MAX_PARAMETERS = 30_000
+
+
+def chunked(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _insert(conn: Connection, table: Table):
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"upsert is not supported on {dialect}")
+    return insert(table)
+
+
+def upsert(conn: Connection, table: Table, rows: List[dict], keys: Sequence[str], returning: Sequence[str]) -> List[Row]:
+    """Insert ``rows`` or update the existing row with the same ``keys``; returns ``returning`` per row."""
+    if not rows:
+        return []
+    columns = list(rows[0])
+    stmt = _insert(conn, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[key] for key in keys],
+        set_={name: stmt.excluded[name] for name in columns if name not in keys},
+    ).returning(*(table.c[name] for name in returning))
+    size = max(MAX_PARAMETERS // len(columns), 1)
+    returned: List[Row] = []
+    for chunk in chunked(rows, size):
+        returned.extend(conn.execute(stmt.values(list(chunk))).all())
+    return returned
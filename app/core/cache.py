@@ -0,0 +1,271 @@
+"""Namespaced caches with interchangeable in-process and cross-worker backends.
+
+``get_cache(namespace)`` returns an object with ``get``/``set``/``invalidate``/
+``clear``/``get_or_set``. With ``CACHE_BACKEND=memory`` each process keeps its
+own LRU. With ``CACHE_BACKEND=shared`` all workers on the host share one
+mmap'd file (``/dev/shm`` when available). Each namespace has a version
+stamp in the file header, so ``clear()`` in one worker invalidates that
+namespace for every worker without touching individual entries.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+
+
+logger = logging.getLogger("app.cache")
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with optional per-entry TTL."""
+
+    def __init__(self, namespace: str, maxsize: int = 1024):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires = entry
+            if expires and expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        expires = time.monotonic() + ttl if ttl else 0.0
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def get_or_set(self, key: Any, factory: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value, ttl)
+        return value
+
+
+class SharedMemoryStore:
+    """Fixed-size slot table in a shared mmap, guarded by seqlocks.
+
+    Layout: header (magic, slot count, slot size, namespace versions) followed
+    by ``slots`` slots of ``slot_size`` bytes. Each slot starts with
+    ``seq, key_hash, version, expires, length`` followed by the pickled
+    ``(key, value)`` payload. Writers serialize on ``flock``; readers never
+    lock and retry or miss when the slot sequence number changes under them.
+    """
+
+    MAGIC = 0x534D5343  # "SMSC"
+    NAMESPACE_SLOTS = 256
+    _HEADER = struct.Struct("<IIII")
+    _VERSION = struct.Struct("<Q")
+    _SLOT = struct.Struct("<QQQdI")
+    PROBES = 4
+
+    def __init__(self, path: str, slots: int, slot_size: int):
+        import fcntl  # POSIX only; get_cache() falls back to LRUCache without it
+
+        self._fcntl = fcntl
+        self.slots = slots
+        self.slot_size = slot_size
+        self.payload_size = slot_size - self._SLOT.size
+        self._versions_offset = self._HEADER.size
+        self._slots_offset = self._versions_offset + self.NAMESPACE_SLOTS * self._VERSION.size
+        size = self._slots_offset + slots * slot_size
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._locked():
+            header = os.pread(self._fd, self._HEADER.size, 0)
+            current = self._HEADER.unpack(header)[:3] if len(header) == self._HEADER.size else None
+            if os.fstat(self._fd).st_size != size or current != (self.MAGIC, slots, slot_size):
+                # Truncating yields a sparse, zero-filled (all slots empty) file.
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, self._HEADER.pack(self.MAGIC, slots, slot_size, 0), 0)
+            self._mm = mmap.mmap(self._fd, size)
+
+    @contextmanager
+    def _locked(self):
+        self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+    @staticmethod
+    def _hash(data: bytes) -> int:
+        # 0 marks an empty slot, so never hand it out as a key hash.
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little") or 1
+
+    def _namespace_offset(self, namespace: str) -> int:
+        return self._versions_offset + (self._hash(namespace.encode()) % self.NAMESPACE_SLOTS) * self._VERSION.size
+
+    def namespace_version(self, namespace: str) -> int:
+        return self._VERSION.unpack_from(self._mm, self._namespace_offset(namespace))[0]
+
+    def bump_namespace(self, namespace: str) -> None:
+        offset = self._namespace_offset(namespace)
+        with self._locked():
+            version = self._VERSION.unpack_from(self._mm, offset)[0]
+            self._VERSION.pack_into(self._mm, offset, version + 1)
+
+    def _slot_offsets(self, key_hash: int):
+        base = key_hash % self.slots
+        for probe in range(self.PROBES):
+            yield self._slots_offset + ((base + probe) % self.slots) * self.slot_size
+
+    def get(self, namespace: str, key: Any) -> Any:
+        full_key = (namespace, key)
+        key_hash = self._hash(pickle.dumps(full_key))
+        version = self.namespace_version(namespace)
+        for offset in self._slot_offsets(key_hash):
+            for _ in range(3):
+                seq, slot_hash, slot_version, expires, length = self._SLOT.unpack_from(self._mm, offset)
+                if seq & 1:
+                    continue  # write in progress
+                if slot_hash != key_hash:
+                    break
+                start = offset + self._SLOT.size
+                payload = self._mm[start:start + length]
+                if self._SLOT.unpack_from(self._mm, offset)[0] != seq:
+                    continue  # torn read, retry
+                if slot_version != version or (expires and expires < time.time()):
+                    return _MISSING
+                try:
+                    stored_key, value = pickle.loads(payload)
+                except Exception:
+                    return _MISSING
+                return value if stored_key == full_key else _MISSING
+        return _MISSING
+
+    def _write(self, offset: int, key_hash: int, version: int, expires: float, payload: bytes) -> None:
+        seq = self._SLOT.unpack_from(self._mm, offset)[0]
+        self._SLOT.pack_into(self._mm, offset, seq + 1, 0, 0, 0.0, 0)
+        start = offset + self._SLOT.size
+        self._mm[start:start + len(payload)] = payload
+        self._SLOT.pack_into(self._mm, offset, seq + 2, key_hash, version, expires, len(payload))
+
+    def set(self, namespace: str, key: Any, value: Any, ttl: Optional[float] = None) -> bool:
+        full_key = (namespace, key)
+        key_hash = self._hash(pickle.dumps(full_key))
+        payload = pickle.dumps((full_key, value), protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.payload_size:
+            return False
+        expires = time.time() + ttl if ttl else 0.0
+        with self._locked():
+            version = self.namespace_version(namespace)
+            target = None
+            for offset in self._slot_offsets(key_hash):
+                _, slot_hash, slot_version, slot_expires, _ = self._SLOT.unpack_from(self._mm, offset)
+                stale = slot_version != version or (slot_expires and slot_expires < time.time())
+                if slot_hash in (0, key_hash) or (stale and target is None):
+                    target = offset
+                    if slot_hash in (0, key_hash):
+                        break
+            if target is None:
+                target = next(self._slot_offsets(key_hash))  # evict the home slot
+            self._write(target, key_hash, version, expires, payload)
+        return True
+
+    def invalidate(self, namespace: str, key: Any) -> None:
+        key_hash = self._hash(pickle.dumps((namespace, key)))
+        with self._locked():
+            for offset in self._slot_offsets(key_hash):
+                if self._SLOT.unpack_from(self._mm, offset)[1] == key_hash:
+                    self._write(offset, 0, 0, 0.0, b"")
+
+
+class SharedCache:
+    """Namespace view over a ``SharedMemoryStore`` with the ``LRUCache`` API."""
+
+    def __init__(self, namespace: str, store: SharedMemoryStore):
+        self.namespace = namespace
+        self._store = store
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self._store.get(self.namespace, key)
+        return default if value is _MISSING else value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        if not self._store.set(self.namespace, key, value, ttl):
+            logger.debug("Value for %s:%r exceeds the shared slot size; not cached", self.namespace, key)
+
+    def invalidate(self, key: Any) -> None:
+        self._store.invalidate(self.namespace, key)
+
+    def clear(self) -> None:
+        self._store.bump_namespace(self.namespace)
+
+    def get_or_set(self, key: Any, factory: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        value = self._store.get(self.namespace, key)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value, ttl)
+        return value
+
+
+_caches: Dict[str, Any] = {}
+_store: Optional[SharedMemoryStore] = None
+_lock = threading.Lock()
+
+
+def _default_shm_path() -> str:
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"sms-cache-{settings.PORT}")
+
+
+def _shared_store() -> Optional[SharedMemoryStore]:
+    global _store
+    if _store is None:
+        try:
+            _store = SharedMemoryStore(
+                settings.CACHE_SHM_PATH or _default_shm_path(),
+                settings.CACHE_SHM_SLOTS,
+                settings.CACHE_SHM_SLOT_SIZE,
+            )
+        except (ImportError, OSError) as exc:
+            logger.warning("Shared cache unavailable (%s); using in-process LRU", exc)
+            return None
+    return _store
+
+
+def get_cache(namespace: str, maxsize: int = 1024):
+    """Return the cache for ``namespace`` on the configured backend."""
+    cache = _caches.get(namespace)
+    if cache is not None:
+        return cache
+    with _lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            store = _shared_store() if settings.CACHE_BACKEND == "shared" else None
+            cache = SharedCache(namespace, store) if store else LRUCache(namespace, maxsize)
+            _caches[namespace] = cache
+    return cache
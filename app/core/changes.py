@@ -0,0 +1,200 @@
+"""Change feed: a sequenced log of row inserts, updates and deletes.
+
+Session events append one ``change_log`` row per changed entity inside the
+flush that writes it, so the entry commits or rolls back with the mutation.
+``seq`` is monotonic; clients pull ``/changes?since=<seq>`` and apply the
+row snapshots in order. Compaction first drops entries superseded by a
+later change to the same row (clients apply snapshots as upserts, so only
+the last one matters), then trims entries past the retention window and
+raises the watermark below which clients must resync in full.
+
+Writes that bypass the ORM session call ``record_changes`` themselves.
+
+Sequence numbers must become visible in order: a client that has seen
+``seq`` N never looks below it again. ``seq`` is drawn at insert time, so a
+transaction can commit a lower seq after another has committed a higher one.
+SQLite serializes writers with its database write lock. On PostgreSQL the
+readers hold back instead: before its first entry a writer takes a shared
+advisory lock keyed by the last seq issued so far, a lower bound on every seq
+it will draw, and holds it until commit. Shared locks never wait on each
+other, so writers stay concurrent, and ``latest_seq`` stops at the lowest
+key still held (and at the last seq issued before it looked at the locks).
+"""
+import json
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, event, func, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, aliased
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal, engine
+
+
+# Tables mirrored into the feed. Users (password hashes) and internal tables are not.
+TRACKED = {
+    model.__tablename__: model
+    for model in (
+        models.Department,
+        models.Subject,
+        models.Student,
+        models.Result,
+        models.Fee,
+        models.Clearance,
+        models.Announcement,
+    )
+}
+_TRACKED_TYPES = tuple(TRACKED.values())
+WATERMARK = "change_log_trimmed"
+# Advisory lock class for PostgreSQL change-log writers; the second key is a seq.
+_WRITER_LOCK = 0x63686C67
+_LAST_ISSUED = "pg_sequence_last_value(pg_get_serial_sequence('change_log', 'seq')::regclass)"
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _snapshot(obj) -> str:
+    table = obj.__table__
+    return json.dumps({column.key: getattr(obj, column.key) for column in table.columns}, default=_json_default)
+
+
+def _append(conn: Connection, entries: List[dict]) -> None:
+    if conn.dialect.name == "postgresql":
+        # Read before the lock is taken, so every seq drawn under it is higher.
+        conn.execute(
+            text(f"SELECT pg_advisory_xact_lock_shared(:key, coalesce({_LAST_ISSUED}, 0)::integer)"),
+            {"key": _WRITER_LOCK},
+        )
+    conn.execute(insert(models.ChangeLog), entries)
+
+
+def record_changes(conn: Connection, table_name: str, op: str, rows: Iterable[dict]) -> None:
+    """Append entries for rows written outside the ORM (``rows`` hold full column values)."""
+    if not settings.CHANGE_LOG_ENABLED:
+        return
+    now = datetime.utcnow()
+    entries = [
+        {
+            "table_name": table_name,
+            "row_id": row["id"],
+            "op": op,
+            "data": None if op == "delete" else json.dumps(row, default=_json_default),
+            "changed_at": now,
+        }
+        for row in rows
+    ]
+    if entries:
+        _append(conn, entries)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _log_flush(session: Session, flush_context) -> None:
+    if not settings.CHANGE_LOG_ENABLED:
+        return
+    now = datetime.utcnow()
+    entries: List[dict] = []
+    for op, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            if not isinstance(obj, _TRACKED_TYPES):
+                continue
+            if op == "update" and not session.is_modified(obj, include_collections=False):
+                continue
+            entries.append({
+                "table_name": obj.__tablename__,
+                "row_id": obj.id,
+                "op": op,
+                "data": None if op == "delete" else _snapshot(obj),
+                "changed_at": now,
+            })
+    if entries:
+        _append(session.connection(), entries)
+
+
+def watermark(conn: Connection) -> int:
+    """Highest sequence number removed by trimming; older cursors must resync."""
+    return conn.execute(
+        select(models.ChangeFeedState.value).where(models.ChangeFeedState.name == WATERMARK)
+    ).scalar() or 0
+
+
+def _in_flight_floor(conn: Connection) -> Optional[int]:
+    """Highest seq no uncommitted PostgreSQL writer can still publish at or below."""
+    issued = conn.execute(text(f"SELECT coalesce({_LAST_ISSUED}, 0)")).scalar()
+    # A writer that locks after this query draws seqs above ``issued``.
+    held = conn.execute(
+        text(
+            "SELECT min(objid::bigint) FROM pg_locks WHERE locktype = 'advisory' AND classid = :key"
+            " AND objsubid = 2 AND database = (SELECT oid FROM pg_database WHERE datname = current_database())"
+        ),
+        {"key": _WRITER_LOCK},
+    ).scalar()
+    return issued if held is None else min(issued, held)
+
+
+def latest_seq(conn: Connection) -> int:
+    """Newest sequence number below which every entry has committed, even when compaction emptied the log."""
+    floor = _in_flight_floor(conn) if conn.dialect.name == "postgresql" else None
+    latest = conn.execute(select(func.max(models.ChangeLog.seq))).scalar() or 0
+    if floor is not None:
+        latest = min(latest, floor)
+    return max(latest, watermark(conn))
+
+
+def read_changes(
+    conn: Connection, since: int, tables: Optional[List[str]] = None, limit: int = 1000
+) -> Dict[str, object]:
+    """Return up to ``limit`` entries after ``since`` in sequence order."""
+    # Fix the ceiling before reading: an entry committed between the two
+    # statements would otherwise be skipped when an empty page advances the cursor.
+    ceiling = latest_seq(conn)
+    query = select(models.ChangeLog).where(models.ChangeLog.seq > since, models.ChangeLog.seq <= ceiling)
+    if tables:
+        query = query.where(models.ChangeLog.table_name.in_(tables))
+    rows = conn.execute(query.order_by(models.ChangeLog.seq).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changes = [
+        {
+            "seq": row.seq,
+            "table": row.table_name,
+            "id": row.row_id,
+            "op": row.op,
+            "data": json.loads(row.data) if row.data else None,
+            "changed_at": row.changed_at,
+        }
+        for row in rows
+    ]
+    # An empty page still advances the cursor past filtered-out entries.
+    last_seq = rows[-1].seq if rows else max(since, ceiling)
+    return {"changes": changes, "last_seq": last_seq, "has_more": has_more}
+
+
+def compact(retention_days: Optional[int] = None) -> Dict[str, int]:
+    """Coalesce superseded entries and trim those older than the retention window."""
+    retention = settings.CHANGE_LOG_RETENTION_DAYS if retention_days is None else retention_days
+    cutoff = datetime.utcnow() - timedelta(days=retention)
+    log = models.ChangeLog
+    later = aliased(models.ChangeLog)
+    with engine.begin() as conn:
+        superseded = conn.execute(
+            delete(log).where(
+                select(later.seq)
+                .where(later.table_name == log.table_name, later.row_id == log.row_id, later.seq > log.seq)
+                .exists()
+            )
+        ).rowcount
+        trim_through = conn.execute(select(func.max(log.seq)).where(log.changed_at < cutoff)).scalar()
+        trimmed = 0
+        if trim_through:
+            trimmed = conn.execute(delete(log).where(log.seq <= trim_through)).rowcount
+            current = watermark(conn)
+            if trim_through > current:
+                conn.execute(delete(models.ChangeFeedState).where(models.ChangeFeedState.name == WATERMARK))
+                conn.execute(insert(models.ChangeFeedState).values(name=WATERMARK, value=trim_through))
+    return {"superseded": superseded, "trimmed": trimmed}
@@ -0,0 +1,85 @@
+"""Response shaping for list endpoints: ``?include=a,b.c`` and ``?fields=x,y``.
+
+Each router declares which include paths it supports and how to load them.
+Many-to-one relationships use ``joinedload`` so an expanded list still costs
+exactly one query, however many rows it returns; cached reference data is
+expanded from the snapshot without touching the database.
+
+``fields`` selects top-level columns. Without includes the query becomes a
+Core projection of just those columns; with includes it uses ``load_only``.
+Either way rows are serialized through a schema trimmed to the requested
+fields, so query cost, memory and payload all shrink together.
+"""
+from functools import lru_cache
+from typing import Any, Collection, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, load_only
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.schemas import ExpandableModel
+
+
+def parse_names(value: Optional[str], allowed: Collection[str], kind: str) -> List[str]:
+    """Split a comma-separated query parameter; names outside ``allowed`` are a 400."""
+    requested = list(dict.fromkeys(part.strip() for part in (value or "").split(",") if part.strip()))
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {kind} {', '.join(unknown)}; allowed: {', '.join(sorted(allowed))}",
+        )
+    return requested
+
+
+def parse_include(include: Optional[str], allowed: Collection[str]) -> List[str]:
+    """Validate a comma-separated include list; unknown paths are a 400."""
+    return parse_names(include, allowed, "include")
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> List[str]:
+    """Validate a comma-separated list of ``schema`` column fields; unknown names are a 400."""
+    columns = [name for name, info in schema.model_fields.items() if not info.serialization_alias]
+    return parse_names(fields, columns, "fields")
+
+
+def joined(*path) -> LoaderOption:
+    """``joinedload`` chained along ``path`` (e.g. Result.student_rel, Student.department_rel)."""
+    option = joinedload(path[0])
+    for attr in path[1:]:
+        option = option.joinedload(attr)
+    return option
+
+
+def fetch(db: Session, model, fields: Sequence[str], options: Sequence[LoaderOption], *criteria) -> list:
+    """Load ``model`` rows matching ``criteria``, restricted to ``fields`` when given."""
+    if fields and not options:
+        table = model.__table__
+        return db.execute(select(*(table.c[name] for name in fields)).where(*criteria)).all()
+    query = db.query(model)
+    if fields:
+        query = query.options(load_only(*(getattr(model, name) for name in fields)))
+    return query.options(*options).filter(*criteria).all()
+
+
+@lru_cache(maxsize=128)
+def _trimmed_adapter(schema: Type[BaseModel], fields: Tuple[str, ...]) -> TypeAdapter:
+    # Relationship fields (the aliased ones) are kept so includes still serialize.
+    selected = {
+        name: (info.annotation, info)
+        for name, info in schema.model_fields.items()
+        if name in fields or info.serialization_alias
+    }
+    trimmed = create_model(f"{schema.__name__}Fields", __base__=ExpandableModel, **selected)
+    return TypeAdapter(List[trimmed])
+
+
+def shaped(items: list, schema: Type[BaseModel], fields: Sequence[str]) -> Any:
+    """Return ``items`` unchanged, or serialized through ``schema`` trimmed to ``fields``."""
+    if not fields:
+        return items
+    adapter = _trimmed_adapter(schema, tuple(fields))
+    rows = adapter.validate_python(items, from_attributes=True)
+    return Response(content=adapter.dump_json(rows, by_alias=True, exclude_unset=True), media_type="application/json")
@@ -0,0 +1,304 @@
+"""In-process background jobs: a persistent jobs table and a local process pool.
+
+Job kinds are plain module-level functions registered with ``@register_job``.
+They take a ``JobContext`` plus keyword parameters and run in a spawned
+worker process with its own database connection. Submitting inserts a
+``queued`` row; a worker claims it with a conditional UPDATE, so a job runs
+at most once even with several web workers. No external broker is involved.
+
+If a worker process dies (OOM kill, crash in a native extension) the pool is
+discarded and rebuilt on the next dispatch. Jobs it had claimed are marked
+failed; jobs it had not yet started are handed to the new pool.
+
+A running job's worker refreshes ``updated_at`` every
+``JOB_HEARTBEAT_SECONDS`` however rarely the job reports progress, so
+recovery at startup only fails jobs whose worker is really gone. The final
+status is written only while the job is still ``running``, so a job that
+recovery did fail is never reported as succeeded afterwards.
+"""
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.core.startup import register_shutdown
+
+
+logger = logging.getLogger("app.jobs")
+
+_registry: Dict[str, Callable[..., Any]] = {}
+
+
+def register_job(kind: str):
+    """Decorator registering a job function under ``kind``."""
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        _registry[kind] = func
+        return func
+    return decorator
+
+
+def job_kinds() -> Dict[str, Callable[..., Any]]:
+    _load_job_modules()
+    return dict(_registry)
+
+
+def _load_job_modules() -> None:
+    # Job implementations live outside core; importing registers them.
+    from app import reports  # noqa: F401
+
+
+def validate_params(kind: str, params: dict) -> Optional[str]:
+    """Return an error message when ``params`` do not fit the job's signature."""
+    func = job_kinds().get(kind)
+    if func is None:
+        return f"Unknown job kind '{kind}'"
+    try:
+        inspect.signature(func).bind(None, **params)
+    except TypeError as exc:
+        return str(exc)
+    return None
+
+
+class JobContext:
+    """Handle passed to job functions for progress reporting and output files."""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._last_report = 0.0
+
+    @property
+    def output_dir(self) -> str:
+        path = os.path.join(settings.JOBS_DIR, str(self.job_id))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def output_path(self, filename: str) -> str:
+        return os.path.join(self.output_dir, filename)
+
+    def progress(self, fraction: float, message: str = "", force: bool = False) -> None:
+        """Record progress (0..1); writes are throttled to keep the jobs table cool."""
+        now = time.monotonic()
+        if not force and now - self._last_report < settings.JOB_PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    update(models.Job)
+                    .where(models.Job.id == self.job_id)
+                    .values(progress=max(0.0, min(1.0, fraction)), message=message, updated_at=datetime.utcnow())
+                )
+        except OperationalError as exc:
+            # Progress is advisory; a busy database must not fail the job.
+            logger.warning("Could not record progress for job %s: %s", self.job_id, exc)
+
+    @contextmanager
+    def heartbeat(self):
+        """Keep ``updated_at`` fresh from a background thread while the block runs."""
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(settings.JOB_HEARTBEAT_SECONDS):
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(
+                            update(models.Job)
+                            .where(models.Job.id == self.job_id, models.Job.status == "running")
+                            .values(updated_at=datetime.utcnow())
+                        )
+                except OperationalError as exc:
+                    logger.warning("Could not record a heartbeat for job %s: %s", self.job_id, exc)
+
+        thread = threading.Thread(target=beat, name=f"job-{self.job_id}-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+
+def run_job(job_id: int) -> None:
+    """Worker-process entry point: claim, execute and record one job."""
+    _load_job_modules()
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        claimed = conn.execute(
+            update(models.Job)
+            .where(models.Job.id == job_id, models.Job.status == "queued")
+            .values(status="running", started_at=now, updated_at=now)
+        ).rowcount
+    if not claimed:
+        return
+
+    db = SessionLocal()
+    try:
+        job = db.get(models.Job, job_id)
+        func = _registry[job.kind]
+        params = json.loads(job.params or "{}")
+    finally:
+        db.close()
+
+    ctx = JobContext(job_id)
+    with ctx.heartbeat():
+        try:
+            outcome = func(ctx, **params)
+        except Exception:
+            values = {"status": "failed", "error": traceback.format_exc(limit=20)}
+        else:
+            values = {"status": "succeeded", "progress": 1.0}
+            if isinstance(outcome, dict):
+                values["result_path"] = outcome.pop("path", None)
+                values["result"] = json.dumps(outcome, default=str)
+            elif isinstance(outcome, str):
+                values["result_path"] = outcome
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        recorded = conn.execute(
+            update(models.Job)
+            .where(models.Job.id == job_id, models.Job.status == "running")
+            .values(**values, finished_at=now, updated_at=now)
+        ).rowcount
+    if not recorded:
+        logger.warning("Job %s finished (%s) after it was marked failed; keeping that status",
+                       job_id, values["status"])
+
+
+def _init_worker() -> None:
+    # Reports legitimately run long statements; requests keep the short timeout.
+    from app import database
+
+    database.statement_timeout_ms = settings.DB_JOB_STATEMENT_TIMEOUT_MS
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+# A job whose pool broke before a worker claimed it is re-dispatched up to this many times.
+_MAX_DISPATCHES = 3
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.JOB_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def _discard_executor(broken: ProcessPoolExecutor) -> None:
+    """Drop a pool whose worker died so the next dispatch builds a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _fail(job_id: int, error: str, statuses=("queued", "running")) -> bool:
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        return bool(conn.execute(
+            update(models.Job)
+            .where(models.Job.id == job_id, models.Job.status.in_(statuses))
+            .values(status="failed", error=error, finished_at=now, updated_at=now)
+        ).rowcount)
+
+
+def _on_done(job_id: int, attempt: int, executor: ProcessPoolExecutor):
+    def callback(future) -> None:
+        if future.cancelled():
+            return  # shutdown: the job stays queued and is recovered on restart
+        exc = future.exception()
+        if exc is None:
+            return
+        if not isinstance(exc, BrokenProcessPool):
+            logger.error("Job %s raised in its worker: %r", job_id, exc)
+            _fail(job_id, f"Worker error: {exc!r}")
+            return
+        logger.error("Job worker died while job %s was in flight: %r", job_id, exc)
+        _discard_executor(executor)
+        try:
+            # A claimed job may be what killed the worker: fail it. One still
+            # queued never ran, so hand it to the fresh pool.
+            if not _fail(job_id, "Interrupted: job worker process died", statuses=("running",)):
+                dispatch(job_id, attempt + 1)
+        except Exception:
+            logger.exception("Could not recover job %s after a worker died", job_id)
+    return callback
+
+
+def dispatch(job_id: int, attempt: int = 1) -> None:
+    """Hand a queued job to the local process pool, rebuilding the pool if it broke."""
+    while True:
+        if attempt > _MAX_DISPATCHES:
+            _fail(job_id, "Could not start: job worker pool keeps breaking", statuses=("queued",))
+            return
+        executor = _get_executor()
+        try:
+            future = executor.submit(run_job, job_id)
+        except BrokenProcessPool:
+            _discard_executor(executor)
+            attempt += 1
+            continue
+        future.add_done_callback(_on_done(job_id, attempt, executor))
+        return
+
+
+def submit(db, kind: str, params: dict, created_by: str) -> models.Job:
+    """Persist a new job and dispatch it."""
+    job = models.Job(kind=kind, params=json.dumps(params), created_by=created_by)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    dispatch(job.id)
+    return job
+
+
+def recover() -> None:
+    """Fail jobs orphaned by a dead process and re-dispatch queued ones."""
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+    with engine.begin() as conn:
+        conn.execute(
+            update(models.Job)
+            .where(models.Job.status == "running", models.Job.updated_at < stale_before)
+            .values(
+                status="failed",
+                error="Interrupted: worker stopped before completion",
+                finished_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+            )
+        )
+        queued = conn.execute(
+            select(models.Job.id).where(models.Job.status == "queued")
+        ).scalars().all()
+    for job_id in queued:
+        dispatch(job_id)
+
+
+@register_shutdown
+def shutdown_executor() -> None:
+    """Stop accepting work; queued jobs stay queued and are recovered on restart."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
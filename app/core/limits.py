@@ -0,0 +1,152 @@
+"""Admission control: per-route-class concurrency limits and login throttling.
+
+Expensive routes declare ``dependencies=[Depends(admission("heavy"))]``. Each
+route class admits ``limit`` concurrent requests and parks up to
+``queue_size`` more for at most ``timeout`` seconds. Anything beyond that is
+shed immediately with 503 and ``Retry-After``, so bursts of heavy requests
+cannot monopolise the threadpool that cheap lookups also need.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from app.config import settings
+from app.core.metrics import registry
+
+
+ADMISSION_ACTIVE = registry.gauge(
+    "admission_active_requests", "Requests currently admitted per route class.", ("route_class",)
+)
+ADMISSION_QUEUED = registry.gauge(
+    "admission_queue_depth", "Requests waiting for admission per route class.", ("route_class",)
+)
+ADMISSION_REJECTED = registry.counter(
+    "admission_rejected_total", "Requests shed with 503 per route class.", ("route_class", "reason")
+)
+LOGIN_THROTTLED = registry.counter(
+    "login_throttled_total", "Login attempts rejected by the per-client token bucket."
+)
+
+
+class ConcurrencyLimiter:
+    """Semaphore with a bounded, time-limited wait queue."""
+
+    def __init__(self, name: str, limit: int, queue_size: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _publish(self) -> None:
+        ADMISSION_ACTIVE.set((self.name,), self.active)
+        ADMISSION_QUEUED.set((self.name,), self.waiting)
+
+    async def acquire(self) -> Optional[str]:
+        """Admit the caller; returns a rejection reason instead when shedding."""
+        if self._semaphore is None:
+            # Created lazily so it binds to the serving event loop.
+            self._semaphore = asyncio.Semaphore(self.limit)
+        # Count our own waiters: wait_for() defers the acquire to a new task,
+        # so the semaphore itself does not look locked to concurrent callers.
+        if self.active + self.waiting >= self.limit + self.queue_size:
+            return "queue_full"
+        self.waiting += 1
+        self._publish()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            return "queue_timeout"
+        finally:
+            self.waiting -= 1
+            self._publish()
+        self.active += 1
+        self._publish()
+        return None
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+        self._publish()
+
+
+def _route_classes() -> Dict[str, ConcurrencyLimiter]:
+    return {
+        "heavy": ConcurrencyLimiter(
+            "heavy", settings.HEAVY_CONCURRENCY, settings.HEAVY_QUEUE_SIZE, settings.HEAVY_QUEUE_TIMEOUT
+        ),
+    }
+
+
+limiters = _route_classes()
+
+
+def admission(route_class: str):
+    """Dependency factory holding a slot of ``route_class`` for the whole request."""
+    async def admit():
+        limiter = limiters.get(route_class)
+        if not settings.ADMISSION_ENABLED or limiter is None or limiter.limit <= 0:
+            yield
+            return
+        reason = await limiter.acquire()
+        if reason:
+            ADMISSION_REJECTED.inc((route_class, reason))
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": str(settings.RETRY_AFTER_SECONDS)},
+            )
+        try:
+            yield
+        finally:
+            limiter.release()
+    return admit
+
+
+class TokenBucket:
+    """Per-key token buckets refilled lazily; least recently seen keys are evicted."""
+
+    def __init__(self, rate_per_second: float, burst: int, max_keys: int = 10_000):
+        self.rate = rate_per_second
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def take(self, key: str) -> float:
+        """Consume a token; returns 0 on success or seconds until one is available."""
+        now = time.monotonic()
+        bucket = self._buckets.pop(key, None) or [float(self.burst), now]
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate if self.rate > 0 else float("inf")
+        self._buckets[key] = [tokens, now]
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+login_bucket = TokenBucket(settings.LOGIN_RATE_PER_MINUTE / 60.0, settings.LOGIN_BURST)
+
+
+async def throttle_login(request: Request) -> None:
+    """Reject login attempts beyond the per-client rate with 429."""
+    if not settings.ADMISSION_ENABLED or settings.LOGIN_RATE_PER_MINUTE <= 0:
+        return
+    client = request.client.host if request.client else "unknown"
+    wait = login_bucket.take(client)
+    if wait:
+        LOGIN_THROTTLED.inc()
+        raise HTTPException(
+            status_code=429,
+            detail="Too many login attempts, please wait",
+            headers={"Retry-After": str(math.ceil(wait) if wait != float("inf") else 60)},
+        )
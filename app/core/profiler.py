@@ -0,0 +1,201 @@
+"""Opt-in request-scoped SQL profiler with slow-query log and N+1 detection."""
+import itertools
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Describe bound parameters by type only, so values never reach the log."""
+    if executemany:
+        rows = list(parameters) if parameters is not None else []
+        first = parameter_shape(rows[0]) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in sorted(parameters.items())) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+class RequestProfile:
+    """Statements executed while serving one request."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, method: str, path: str):
+        self.id = next(self._ids)
+        self.method = method
+        self.path = path
+        self.started_at = datetime.utcnow()
+        self.duration = 0.0
+        self.status = 0
+        self.statements: List[Dict[str, Any]] = []
+
+    def record(self, statement: str, shape: str, elapsed: float) -> None:
+        self.statements.append({"statement": statement, "parameters": shape, "duration_ms": elapsed * 1000})
+
+    def n_plus_one_candidates(self, threshold: int) -> List[Dict[str, Any]]:
+        """Statements repeated at least ``threshold`` times within the request."""
+        counts = Counter(s["statement"] for s in self.statements)
+        return [
+            {"statement": statement, "count": count}
+            for statement, count in counts.most_common()
+            if count >= threshold
+        ]
+
+    def summary(self, threshold: int) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "query_count": len(self.statements),
+            "db_time_ms": round(sum(s["duration_ms"] for s in self.statements), 3),
+            "n_plus_one": self.n_plus_one_candidates(threshold),
+        }
+
+    def detail(self, threshold: int) -> Dict[str, Any]:
+        return {**self.summary(threshold), "statements": self.statements}
+
+
+class SQLProfiler:
+    """Collects per-request statement timings into a bounded history."""
+
+    def __init__(
+        self,
+        history: int = 200,
+        slow_query_ms: float = 100.0,
+        n_plus_one_threshold: int = 5,
+    ):
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._history: Deque[RequestProfile] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._current: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+    # -- engine hooks -------------------------------------------------------
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiler_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("profiler_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        profile = self._current.get()
+        if profile is None and elapsed * 1000 < self.slow_query_ms:
+            return
+        shape = parameter_shape(parameters, executemany)
+        if profile is not None:
+            profile.record(statement, shape, elapsed)
+        if elapsed * 1000 >= self.slow_query_ms:
+            slow_query_logger.warning(
+                "%.1fms %s %s | %s | params=%s",
+                elapsed * 1000,
+                profile.method if profile else "-",
+                profile.path if profile else "-",
+                " ".join(statement.split()),
+                shape,
+            )
+
+    def instrument(self, engine: Engine) -> None:
+        """Attach the profiler to an engine (idempotent)."""
+        if not event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    # -- request lifecycle --------------------------------------------------
+    def start(self, method: str, path: str):
+        return self._current.set(RequestProfile(method, path))
+
+    def finish(self, token, status: int, duration: float) -> None:
+        profile = self._current.get()
+        self._current.reset(token)
+        if profile is None:
+            return
+        profile.status = status
+        profile.duration = duration
+        with self._lock:
+            self._history.append(profile)
+
+    # -- inspection ---------------------------------------------------------
+    def recent(self, limit: int = 50, n_plus_one_only: bool = False) -> List[Dict[str, Any]]:
+        with self._lock:
+            profiles = list(self._history)
+        summaries = [p.summary(self.n_plus_one_threshold) for p in reversed(profiles)]
+        if n_plus_one_only:
+            summaries = [s for s in summaries if s["n_plus_one"]]
+        return summaries[:limit]
+
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for profile in self._history:
+                if profile.id == profile_id:
+                    return profile.detail(self.n_plus_one_threshold)
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._history.clear()
+
+
+profiler = SQLProfiler(
+    history=settings.PROFILER_HISTORY,
+    slow_query_ms=settings.SLOW_QUERY_MS,
+    n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD,
+)
+
+
+def configure_slow_query_log(path: str, max_bytes: int, backup_count: int) -> None:
+    """Route slow-query warnings to a size-rotated log file."""
+    if any(isinstance(h, RotatingFileHandler) for h in slow_query_logger.handlers):
+        return
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_query_logger.addHandler(handler)
+    slow_query_logger.setLevel(logging.WARNING)
+    slow_query_logger.propagate = False
+
+
+class ProfilerMiddleware:
+    """Pure ASGI middleware opening a profile around each HTTP request."""
+
+    def __init__(self, app, profiler: SQLProfiler, exclude_prefixes=("/debug", "/metrics", "/static")):
+        self.app = app
+        self.profiler = profiler
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        token = self.profiler.start(scope["method"], scope["path"])
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.profiler.finish(token, status_holder[0], time.perf_counter() - start)
@@ -0,0 +1,195 @@
+"""Read-through cache for reference data (departments, subjects, grading policies).
+
+The tables are loaded together into one immutable ``ReferenceSnapshot``
+with the lookups the API needs pre-indexed, and kept in the ``refdata``
+cache namespace stamped with the reference data version: a counter row in
+``change_feed_state`` that every ORM flush touching one of these tables
+bumps inside its own transaction (imports bump it per chunk). Each process
+reads the committed counter (one primary-key lookup) at most every
+``REFDATA_VERSION_CHECK`` seconds, and right after it commits a reference
+data write itself, and reloads when the cached stamp is behind; in between,
+lookups are plain dictionary reads. So a write made through any worker
+reaches every worker on either cache backend within that interval, and a
+slow load that lands after a newer write is simply reloaded. ``REFDATA_TTL``
+bounds staleness for writes that bump nothing, e.g. seed.py.
+"""
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.core.cache import get_cache
+from app.core.grading import DEFAULT_POLICY, CompiledPolicy
+from app.core.startup import register_warmer
+from app.database import SessionLocal, engine
+
+
+class DepartmentRow(NamedTuple):
+    id: int
+    name: str
+    hod: str
+
+
+class SubjectRow(NamedTuple):
+    id: int
+    name: str
+    semester: int
+    teacher: str
+    department_id: int
+
+
+class ReferenceSnapshot(NamedTuple):
+    departments: Tuple[DepartmentRow, ...]
+    subjects: Tuple[SubjectRow, ...]
+    departments_by_id: Dict[int, DepartmentRow]
+    subjects_by_id: Dict[int, SubjectRow]
+    subjects_by_department: Dict[int, Tuple[SubjectRow, ...]]
+    subjects_by_department_semester: Dict[Tuple[int, int], Tuple[SubjectRow, ...]]
+    # Keyed by department id; the None entry is the campus-wide default.
+    grading_policies: Dict[Optional[int], CompiledPolicy]
+
+    def department(self, department_id: int) -> Optional[DepartmentRow]:
+        return self.departments_by_id.get(department_id)
+
+    def subject(self, subject_id: int) -> Optional[SubjectRow]:
+        return self.subjects_by_id.get(subject_id)
+
+    def subjects_for(self, department_id: int, semester: Optional[int] = None) -> Tuple[SubjectRow, ...]:
+        if semester is None:
+            return self.subjects_by_department.get(department_id, ())
+        return self.subjects_by_department_semester.get((department_id, semester), ())
+
+    def policy_for(self, department_id: Optional[int]) -> CompiledPolicy:
+        policies = self.grading_policies
+        return policies.get(department_id) or policies.get(None) or DEFAULT_POLICY
+
+
+_SNAPSHOT_KEY = "snapshot"
+_TRACKED = (models.Department, models.Subject, models.GradingPolicy)
+VERSION = "refdata_version"
+
+
+# This process's last reading of the committed version.
+_checked = {"at": 0.0, "version": 0}
+
+
+def current_version(conn) -> int:
+    """The committed reference data version (``conn`` may be a Session)."""
+    state = models.ChangeFeedState
+    return conn.execute(select(state.value).where(state.name == VERSION)).scalar() or 0
+
+
+def bump_version(conn: Connection) -> None:
+    """Advance the version inside the caller's transaction, so it commits with the write."""
+    state = models.ChangeFeedState.__table__
+    if not conn.execute(update(state).where(state.c.name == VERSION).values(value=state.c.value + 1)).rowcount:
+        conn.execute(insert(state).values(name=VERSION, value=1))
+
+
+def load_snapshot(db: Session) -> ReferenceSnapshot:
+    """Build a snapshot with three column-only queries."""
+    departments = tuple(
+        DepartmentRow(*row)
+        for row in db.execute(
+            select(models.Department.id, models.Department.name, models.Department.hod)
+            .order_by(models.Department.id)
+        )
+    )
+    subjects = tuple(
+        SubjectRow(*row)
+        for row in db.execute(
+            select(
+                models.Subject.id,
+                models.Subject.name,
+                models.Subject.semester,
+                models.Subject.teacher,
+                models.Subject.department_id,
+            ).order_by(models.Subject.id)
+        )
+    )
+    grading_policies = {
+        department_id: CompiledPolicy.from_json(bands, name=name)
+        for name, department_id, bands in db.execute(
+            select(models.GradingPolicy.name, models.GradingPolicy.department_id, models.GradingPolicy.bands)
+            .order_by(models.GradingPolicy.id)
+        )
+    }
+    by_department: Dict[int, list] = {}
+    by_department_semester: Dict[Tuple[int, int], list] = {}
+    for subject in subjects:
+        by_department.setdefault(subject.department_id, []).append(subject)
+        by_department_semester.setdefault((subject.department_id, subject.semester), []).append(subject)
+    return ReferenceSnapshot(
+        departments=departments,
+        subjects=subjects,
+        departments_by_id={d.id: d for d in departments},
+        subjects_by_id={s.id: s for s in subjects},
+        subjects_by_department={k: tuple(v) for k, v in by_department.items()},
+        subjects_by_department_semester={k: tuple(v) for k, v in by_department_semester.items()},
+        grading_policies=grading_policies,
+    )
+
+
+def recheck_version() -> None:
+    """Make the next ``reference_data`` call read the committed version."""
+    _checked["at"] = 0.0
+
+
+def reference_data(db: Session) -> ReferenceSnapshot:
+    """Return the cached snapshot unless a newer version was committed, loading it through ``db`` then."""
+    cache = get_cache("refdata", maxsize=1)
+    cached = cache.get(_SNAPSHOT_KEY)
+    now = time.monotonic()
+    if cached is None or now - _checked["at"] >= settings.REFDATA_VERSION_CHECK:
+        # Read before the tables: a write landing in between only makes the stamp look older.
+        _checked["version"], _checked["at"] = current_version(db), now
+    version = _checked["version"]
+    if cached is not None and cached[0] >= version:
+        return cached[1]
+    snapshot = load_snapshot(db)
+    cache.set(_SNAPSHOT_KEY, (version, snapshot), ttl=settings.REFDATA_TTL or None)
+    return snapshot
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _track_reference_changes(session: Session, flush_context) -> None:
+    if session.info.get("refdata_changed"):
+        return
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _TRACKED):
+            session.info["refdata_changed"] = True
+            bump_version(session.connection())
+            return
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _recheck_on_commit(session: Session) -> None:
+    if session.info.pop("refdata_changed", False):
+        recheck_version()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_on_rollback(session: Session) -> None:
+    session.info.pop("refdata_changed", None)
+
+
+@register_warmer
+def warm_reference_data() -> None:
+    """Create the version row and load the snapshot before the first request asks for it."""
+    state = models.ChangeFeedState
+    try:
+        with engine.begin() as conn:
+            if not conn.execute(select(state.name).where(state.name == VERSION)).first():
+                conn.execute(insert(state).values(name=VERSION, value=0))
+    except IntegrityError:
+        pass  # another worker created it first
+    db = SessionLocal()
+    try:
+        reference_data(db)
+    finally:
+        db.close()
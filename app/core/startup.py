@@ -0,0 +1,164 @@
+"""Startup helpers: schema version check, warm-up/shutdown hooks and phase timing."""
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+from sqlalchemy import Column, MetaData, String, Table, select
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger("app.startup")
+
+_meta = MetaData()
+schema_version = Table(
+    "schema_version",
+    _meta,
+    Column("name", String, primary_key=True),
+    Column("fingerprint", String, nullable=False),
+)
+
+
+class StartupTimer:
+    """Records how long each named startup phase took."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = seconds
+
+    def report(self) -> Dict[str, float]:
+        report = {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()}
+        report["total"] = round(sum(self.phases.values()) * 1000, 2)
+        return report
+
+
+def schema_fingerprint(metadata: MetaData) -> str:
+    """Hash table, column and index definitions so schema changes are detectable."""
+    parts: List[str] = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        parts.append(f"T:{table.name}")
+        for column in table.columns:
+            parts.append(
+                f"C:{column.name}:{column.type!r}:{column.nullable}:{column.primary_key}:{column.unique}"
+            )
+        # Indexes and constraints live in sets; sort their rendered form so
+        # the fingerprint does not depend on hash randomization.
+        parts.extend(sorted(
+            f"I:{index.name}:{','.join(c.name for c in index.columns)}:{index.unique}"
+            for index in table.indexes
+        ))
+        parts.extend(sorted(
+            f"K:{type(constraint).__name__}:{constraint.name}:{','.join(c.name for c in constraint.columns)}"
+            for constraint in table.constraints
+        ))
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def _create_missing_indexes(engine: Engine, metadata: MetaData) -> bool:
+    """Add indexes declared on tables that already existed; ``create_all`` skips those.
+
+    Returns False when one could not be built (e.g. a new unique index over
+    duplicate rows), so the fingerprint is not stored and the next boot retries.
+    """
+    complete = True
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception:
+                complete = False
+                logger.exception("Could not create index %s on %s; fix the rows it rejects and restart",
+                                 index.name, table.name)
+    return complete
+
+
+def ensure_schema(engine: Engine, metadata: MetaData, name: str = "app", force: bool = False) -> bool:
+    """Run ``create_all`` only when the stored schema fingerprint differs.
+
+    Returns True when DDL was issued. A single primary-key lookup replaces
+    reflecting every table on each boot.
+    """
+    fingerprint = schema_fingerprint(metadata)
+    if not force:
+        try:
+            with engine.connect() as conn:
+                stored = conn.execute(
+                    select(schema_version.c.fingerprint).where(schema_version.c.name == name)
+                ).scalar()
+        except Exception:  # table missing on a fresh database
+            stored = None
+        if stored == fingerprint:
+            return False
+
+    metadata.create_all(bind=engine)
+    complete = _create_missing_indexes(engine, metadata)
+    _meta.create_all(bind=engine)
+    if not complete:
+        return True
+    with engine.begin() as conn:
+        conn.execute(schema_version.delete().where(schema_version.c.name == name))
+        conn.execute(schema_version.insert().values(name=name, fingerprint=fingerprint))
+    return True
+
+
+# Warm-up hooks run once per process before serving traffic.
+_warmers: List[Callable[[], None]] = []
+
+
+def register_warmer(func: Callable[[], None]) -> Callable[[], None]:
+    """Register a callable to run during warm-up; usable as a decorator."""
+    _warmers.append(func)
+    return func
+
+
+def prime_pool(engine: Engine, connections: int) -> None:
+    """Open ``connections`` pooled connections up front so first requests skip connect()."""
+    opened = []
+    try:
+        for _ in range(max(connections, 0)):
+            conn = engine.connect()
+            conn.exec_driver_sql("SELECT 1")
+            opened.append(conn)
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+def warm_up(timer: StartupTimer) -> None:
+    """Run registered warmers, timing each one as its own phase."""
+    for func in _warmers:
+        with timer.phase(f"warmup:{func.__name__}"):
+            try:
+                func()
+            except Exception:
+                logger.exception("Warm-up step %s failed", func.__name__)
+
+
+# Shutdown hooks run in reverse registration order when the app stops.
+_shutdown_hooks: List[Callable[[], None]] = []
+
+
+def register_shutdown(func: Callable[[], None]) -> Callable[[], None]:
+    """Register a callable to run on shutdown; usable as a decorator."""
+    _shutdown_hooks.append(func)
+    return func
+
+
+def shut_down() -> None:
+    """Run shutdown hooks, newest first, logging rather than raising failures."""
+    for func in reversed(_shutdown_hooks):
+        try:
+            func()
+        except Exception:
+            logger.exception("Shutdown step %s failed", func.__name__)
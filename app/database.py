@@ -1,24 +1,161 @@
 """Database connection and session management."""
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import functools
+import inspect
+from typing import Callable
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 from app.config import settings
+from app.core.metrics import TimedQueuePool
+
+
+url = make_url(settings.DATABASE_URL)
+backend = url.get_backend_name()
+_in_memory = backend == "sqlite" and url.database in (None, "", ":memory:")
+
+# Per-process statement timeout, read whenever a PostgreSQL connection is
+# opened; job workers raise it (see app.core.jobs) for long reports.
+statement_timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+
+
+def _engine_options() -> dict:
+    if _in_memory:
+        # One shared connection per thread; there is no pool to size.
+        return {"connect_args": {"check_same_thread": False}}
+    options = {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING and backend != "sqlite",
+    }
+    if backend == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
 
+engine = create_engine(settings.DATABASE_URL, **_engine_options())
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+if backend == "sqlite" and not _in_memory:
+    @event.listens_for(engine, "connect")
+    def _sqlite_wal(dbapi_connection, connection_record):
+        # WAL lets background jobs stream long reads while requests keep writing.
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+if backend == "postgresql":
+    @event.listens_for(engine, "do_connect")
+    def _postgres_connect(dialect, connection_record, cargs, cparams):
+        # Session settings travel as startup options, costing no extra round
+        # trip. Streaming reads (``yield_per``) use server-side cursors here.
+        params = dict(cparams)
+        params["options"] = f"{params.get('options', '')} -c statement_timeout={int(statement_timeout_ms)}".strip()
+        params.setdefault("application_name", settings.APP_NAME[:63])
+        return dialect.connect(*cargs, **params)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# GET/HEAD sessions read on autocommit connections, so no transaction is held
+# open between their queries.
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+_READ_METHODS = frozenset({"GET", "HEAD"})
+
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency that provides a database session."""
-    db = SessionLocal()
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_unsaved(session: Session, flush_context) -> None:
+    session.info["unsaved_writes"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(SessionLocal, "after_rollback")
+def _clear_unsaved(session: Session) -> None:
+    session.info.pop("unsaved_writes", None)
+
+
+def get_db(request: Request):
+    """Dependency that provides a database session.
+
+    No connection is checked out until the first query, and routes built with
+    ``SessionRoute`` hand it back as soon as the endpoint returns, before the
+    response is serialized and sent. GET/HEAD requests read in autocommit mode.
+    """
+    db = SessionLocal(bind=read_engine) if request.method in _READ_METHODS else SessionLocal()
+    request.state.db_session = db
     try:
         yield db
     finally:
         db.close()
+
+
+def release_session(db: Session) -> None:
+    """End the session's transaction so its connection returns to the pool.
+
+    Loaded objects stay attached and unexpired; a later lazy load just checks
+    a connection out again. Sessions with uncommitted changes are left for
+    ``close`` to roll back.
+    """
+    if not db.in_transaction() or db.info.get("unsaved_writes") or db.new or db.dirty or db.deleted:
+        return
+    db.expire_on_commit = False
+    db.commit()
+
+
+_REQUEST_PARAM = "_session_request"
+
+
+def _releasing(endpoint: Callable) -> Callable:
+    """Wrap ``endpoint`` to release the request's session once it returns."""
+    if getattr(endpoint, "releases_session", False):
+        # include_router() rebuilds routes from already wrapped endpoints.
+        return endpoint
+    signature = inspect.signature(endpoint)
+    parameters = list(signature.parameters.values())
+    # FastAPI hands a request to one Request-annotated parameter only, so reuse
+    # the endpoint's own if it has one; otherwise add an extra parameter.
+    own = next((p.name for p in parameters if p.annotation is Request), None)
+    if own is None:
+        extra = inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        if parameters and parameters[-1].kind is inspect.Parameter.VAR_KEYWORD:
+            parameters.insert(len(parameters) - 1, extra)
+        else:
+            parameters.append(extra)
+
+    def take_request(kwargs: dict) -> Request:
+        return kwargs[own] if own else kwargs.pop(_REQUEST_PARAM)
+
+    def release(request: Request) -> None:
+        db = getattr(request.state, "db_session", None)
+        if db is not None:
+            release_session(db)
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            request = take_request(kwargs)
+            response = await endpoint(*args, **kwargs)
+            release(request)
+            return response
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            request = take_request(kwargs)
+            response = endpoint(*args, **kwargs)
+            release(request)
+            return response
+
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    wrapper.releases_session = True
+    return wrapper
+
+
+class SessionRoute(APIRoute):
+    """APIRoute that returns the request's DB connection as soon as the endpoint returns."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _releasing(endpoint), **kwargs)
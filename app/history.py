@@ -0,0 +1,214 @@
+"""Periodic dashboard snapshots and the downsampled history behind /dashboard/history.
+
+Every ``DASHBOARD_SNAPSHOT_INTERVAL`` seconds the dashboard figures are
+computed per department with a handful of grouped queries and stored as
+one narrow row per department, plus a campus-wide row (``department_id``
+0), in ``dashboard_snapshots``. Snapshot times are aligned to the interval
+and unique per department, so when every worker runs the snapshotter only
+the first to reach a tick records it. History reads touch only that table.
+"""
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.core.refdata import reference_data
+from app.core.startup import register_shutdown
+from app.database import SessionLocal
+
+
+logger = logging.getLogger("app.history")
+
+CAMPUS = 0
+_EPOCH = datetime(1970, 1, 1)
+_STEP_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def gpa_points_by_department(db: Session) -> Dict[Optional[int], Tuple[float, int]]:
+    """Total grade points and result count per department, grading (department, marks) buckets."""
+    buckets = defaultdict(dict)
+    for department_id, marks, count in db.execute(
+        select(models.Student.department_id, models.Result.total_marks, func.count())
+        .select_from(models.Result)
+        .outerjoin(models.Student, models.Student.id == models.Result.student_id)
+        .group_by(models.Student.department_id, models.Result.total_marks)
+    ):
+        buckets[department_id][marks] = count
+    snapshot = reference_data(db)
+    return {
+        department_id: (snapshot.policy_for(department_id).weighted_total(counts), sum(counts.values()))
+        for department_id, counts in buckets.items()
+    }
+
+
+def collect(db: Session) -> Dict[int, dict]:
+    """Current dashboard figures keyed by department id (``CAMPUS`` for the totals)."""
+    department = models.Student.department_id
+    students = dict(db.execute(select(department, func.count()).group_by(department)).all())
+    subjects = dict(db.execute(
+        select(models.Subject.department_id, func.count()).group_by(models.Subject.department_id)
+    ).all())
+    paid, unpaid = defaultdict(int), defaultdict(int)
+    for department_id, status, count in db.execute(
+        select(department, models.Fee.status, func.count())
+        .select_from(models.Fee)
+        .outerjoin(models.Student, models.Student.id == models.Fee.student_id)
+        .where(models.Fee.status.isnot(None))
+        .group_by(department, models.Fee.status)
+    ):
+        (paid if status == "paid" else unpaid)[department_id] += count
+    cleared = dict(db.execute(
+        select(department, func.count())
+        .select_from(models.Clearance)
+        .outerjoin(models.Student, models.Student.id == models.Clearance.student_id)
+        .where(
+            models.Clearance.library_clearance == True,
+            models.Clearance.finance_clearance == True,
+            models.Clearance.hostel_clearance == True,
+            models.Clearance.department_clearance == True,
+        )
+        .group_by(department)
+    ).all())
+    gpa = gpa_points_by_department(db)
+
+    def figures(department_id: Optional[int]) -> dict:
+        points, results = gpa.get(department_id, (0.0, 0))
+        return {
+            "students": students.get(department_id, 0),
+            "subjects": subjects.get(department_id, 0),
+            "paid_fees": paid.get(department_id, 0),
+            "unpaid_fees": unpaid.get(department_id, 0),
+            "cleared_students": cleared.get(department_id, 0),
+            "results": results,
+            "average_gpa": round(points / results, 2) if results else 0.0,
+        }
+
+    department_ids = set(db.execute(select(models.Department.id)).scalars())
+    rows = {department_id: figures(department_id) for department_id in sorted(department_ids)}
+    # Campus totals also cover rows whose student has no (or an unknown) department.
+    total_points = sum(points for points, _ in gpa.values())
+    total_results = sum(count for _, count in gpa.values())
+    rows[CAMPUS] = {
+        "departments": len(department_ids),
+        "students": sum(students.values()),
+        "subjects": sum(subjects.values()),
+        "paid_fees": sum(paid.values()),
+        "unpaid_fees": sum(unpaid.values()),
+        "cleared_students": sum(cleared.values()),
+        "results": total_results,
+        "average_gpa": round(total_points / total_results, 2) if total_results else 0.0,
+    }
+    return rows
+
+
+def _align(moment: datetime, step: int) -> datetime:
+    seconds = int((moment - _EPOCH).total_seconds())
+    return _EPOCH + timedelta(seconds=seconds - seconds % step)
+
+
+def take_snapshot(db: Session, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Record the current tick unless another worker already has; returns its time."""
+    now = now or datetime.utcnow()
+    tick = _align(now, settings.DASHBOARD_SNAPSHOT_INTERVAL)
+    snapshot = models.DashboardSnapshot
+    if db.execute(select(snapshot.id).where(snapshot.department_id == CAMPUS, snapshot.taken_at == tick)).first():
+        return None
+    db.add_all(
+        snapshot(taken_at=tick, department_id=department_id, **figures)
+        for department_id, figures in collect(db).items()
+    )
+    if settings.DASHBOARD_HISTORY_RETENTION_DAYS:
+        cutoff = now - timedelta(days=settings.DASHBOARD_HISTORY_RETENTION_DAYS)
+        db.execute(delete(snapshot).where(snapshot.taken_at < cutoff))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return None
+    return tick
+
+
+def parse_step(value: str) -> int:
+    """Seconds in a step such as ``900``, ``15m``, ``6h`` or ``1d``."""
+    match = re.fullmatch(r"(\d+)([smhdw]?)", value.strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError("step must be a positive number of seconds or use an s/m/h/d/w suffix")
+    return int(match.group(1)) * _STEP_UNITS[match.group(2) or "s"]
+
+
+def history(db: Session, start: datetime, end: datetime, step: int, department_id: int = CAMPUS) -> List[dict]:
+    """Snapshots in [start, end], keeping the latest sample in each ``step`` bucket."""
+    table = models.DashboardSnapshot.__table__
+    rows = db.execute(
+        select(table)
+        .where(table.c.department_id == department_id, table.c.taken_at >= start, table.c.taken_at <= end)
+        .order_by(table.c.taken_at)
+    )
+    latest = {}
+    for row in rows:
+        latest[_align(row.taken_at, step)] = row
+    points = []
+    for bucket, row in latest.items():
+        point = {
+            "time": bucket.isoformat() + "Z",
+            "taken_at": row.taken_at.isoformat() + "Z",
+            "students": row.students,
+            "subjects": row.subjects,
+            "fees": {"paid": row.paid_fees, "unpaid": row.unpaid_fees},
+            "clearance": {
+                "cleared_students": row.cleared_students,
+                "not_cleared_students": row.students - row.cleared_students,
+            },
+            "results": row.results,
+            "average_gpa": row.average_gpa,
+        }
+        if department_id == CAMPUS:
+            point["departments"] = row.departments
+        points.append(point)
+    return points
+
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _snapshot_loop() -> None:
+    interval = settings.DASHBOARD_SNAPSHOT_INTERVAL
+    while True:
+        db = SessionLocal()
+        try:
+            take_snapshot(db)
+        except Exception:
+            logger.exception("Dashboard snapshot failed")
+        finally:
+            db.close()
+        # Sleep until just past the next aligned tick.
+        if _stop.wait(interval - time.time() % interval + 1):
+            return
+
+
+def start_snapshotter() -> None:
+    """Start this process's snapshot thread (idempotent)."""
+    global _thread
+    if _thread is None or not _thread.is_alive():
+        _stop.clear()
+        _thread = threading.Thread(target=_snapshot_loop, name="dashboard-snapshots", daemon=True)
+        _thread.start()
+
+
+@register_shutdown
+def stop_snapshotter() -> None:
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=5)
+        _thread = None
@@ -0,0 +1,228 @@
+"""Streaming CSV/NDJSON import of departments, subjects and students.
+
+The upload is read a line at a time, so memory is bounded by the chunk size
+(plus the keys seen so far for unique columns) rather than by the file.
+Rows are validated with the create routes' schemas, ``IMPORT_CHUNK_SIZE``
+at a time; a ``department`` column holding a name resolves through an
+in-memory map of department names, compared case-insensitively (so a new
+department cannot differ from an existing one only in case). Each chunk's
+valid rows go in with one executemany in their own transaction and are
+appended to the change feed (and, for departments and subjects, bump the
+reference data version).
+Failed rows are reported by line number and skipped; chunks already
+committed stay committed, so a file can be fixed and re-imported minus the
+rows that made it in.
+"""
+import csv
+import io
+import json
+import time
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+
+from app import models, schemas
+from app.config import settings
+from app.core.changes import record_changes
+from app.core.refdata import bump_version, recheck_version
+from app.database import engine
+
+
+ENTITIES = {
+    "departments": (models.Department, schemas.DepartmentCreate),
+    "subjects": (models.Subject, schemas.SubjectCreate),
+    "students": (models.Student, schemas.StudentCreate),
+}
+# Columns unique across the table, checked against the file and the database.
+UNIQUE = {"departments": ("name",), "students": ("email", "roll_no")}
+# Unique columns compared case-insensitively, as department names are resolved.
+FOLDED = {"departments": ("name",)}
+# Entities cached in the reference data snapshot; their chunks bump its version.
+REFERENCE = ("departments", "subjects")
+FORMATS = ("csv", "ndjson")
+_CONTENT_TYPES = {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/jsonl": "ndjson"}
+_SUFFIXES = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Guess the format from the upload's content type, then its file extension."""
+    if content_type in _CONTENT_TYPES:
+        return _CONTENT_TYPES[content_type]
+    for suffix, fmt in _SUFFIXES.items():
+        if (filename or "").lower().endswith(suffix):
+            return fmt
+    return None
+
+
+def read_records(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield ``(line, record, error)`` for each row of a CSV (with header) or NDJSON stream."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    line = 0
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text)
+            if not reader.fieldnames:
+                raise ValueError("The CSV file has no header row")
+            for row in reader:
+                line = reader.line_num
+                # Blank cells count as missing; cells beyond the header are ignored.
+                yield line, {
+                    key.strip(): value.strip()
+                    for key, value in row.items()
+                    if key is not None and value is not None and value.strip()
+                }, None
+        else:
+            for raw in text:
+                line += 1
+                if not raw.strip():
+                    continue
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    yield line, None, "Invalid JSON"
+                    continue
+                if not isinstance(record, dict):
+                    yield line, None, "Expected a JSON object"
+                    continue
+                yield line, record, None
+    except UnicodeDecodeError:
+        # Earlier chunks may already be committed, so report rather than raise.
+        yield line + 1, None, "Not valid UTF-8; stopped reading here"
+    finally:
+        # Leave the upload's file open for its owner to close.
+        text.detach()
+
+
+def _fold(name: str) -> str:
+    return name.strip().lower()
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class _Importer:
+    """Validates and inserts one upload's records chunk by chunk, collecting the report."""
+
+    def __init__(self, conn: Connection, entity: str):
+        self.model, self.schema = ENTITIES[entity]
+        self.table = self.model.__table__
+        self.entity = entity
+        self.unique = UNIQUE.get(entity, ())
+        self.folded = FOLDED.get(entity, ())
+        self.seen: Dict[str, Set] = {column: set() for column in self.unique}
+        departments = conn.execute(select(models.Department.id, models.Department.name)).all()
+        # Ids come from every row: names that fold together (or are empty) map to one id at most.
+        self.department_ids = {department_id for department_id, _ in departments}
+        self.departments = {_fold(name): department_id for department_id, name in departments if name}
+        self.rows = self.inserted = self.failed = 0
+        self.errors: List[dict] = []
+
+    def fail(self, line: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def validate(self, line: int, record: dict) -> Optional[dict]:
+        if "department_id" in self.schema.model_fields:
+            name = record.pop("department", None)
+            if name is not None and "department_id" not in record:
+                department_id = self.departments.get(_fold(str(name)))
+                if department_id is None:
+                    self.fail(line, f"Unknown department {name!r}")
+                    return None
+                record["department_id"] = department_id
+        try:
+            row = self.schema.model_validate(record).model_dump()
+        except ValidationError as exc:
+            self.fail(line, _validation_message(exc))
+            return None
+        if "department_id" in row and row["department_id"] not in self.department_ids:
+            self.fail(line, f"Unknown department_id {row['department_id']}")
+            return None
+        keys = {column: self.key(column, row[column]) for column in self.unique}
+        for column, key in keys.items():
+            if key in self.seen[column]:
+                self.fail(line, f"Duplicate {column} {row[column]!r} earlier in the file")
+                return None
+        if self.entity == "departments" and keys["name"] in self.departments:
+            self.fail(line, f"name {row['name']!r} already exists")
+            return None
+        for column, key in keys.items():
+            self.seen[column].add(key)
+        return row
+
+    def key(self, column: str, value):
+        return _fold(value) if column in self.folded else value
+
+    def insert_chunk(self, chunk: List[Tuple[int, dict]]) -> None:
+        try:
+            with engine.begin() as conn:
+                for column in self.unique:
+                    stored = self.table.c[column]
+                    if column in self.folded:
+                        stored = func.lower(func.trim(stored))
+                    taken = set(conn.execute(
+                        select(stored).where(stored.in_([self.key(column, row[column]) for _, row in chunk]))
+                    ).scalars())
+                    if taken:
+                        for line, row in chunk:
+                            if self.key(column, row[column]) in taken:
+                                self.fail(line, f"{column} {row[column]!r} already exists")
+                        chunk = [(line, row) for line, row in chunk if self.key(column, row[column]) not in taken]
+                if not chunk:
+                    return
+                rows = [row for _, row in chunk]
+                ids = conn.execute(
+                    insert(self.table).returning(self.table.c.id, sort_by_parameter_order=True), rows
+                ).scalars().all()
+                record_changes(conn, self.table.name, "insert", [{"id": id_, **row} for id_, row in zip(ids, rows)])
+                if self.entity in REFERENCE:
+                    bump_version(conn)
+        except IntegrityError as exc:
+            # A concurrent writer took a unique value after the check above.
+            for line, _ in chunk:
+                self.fail(line, f"Chunk rolled back: {exc.orig}")
+            return
+        self.inserted += len(chunk)
+        if self.entity == "departments":
+            for id_, row in zip(ids, rows):
+                self.departments[_fold(row["name"])] = id_
+                self.department_ids.add(id_)
+
+
+def import_file(stream: BinaryIO, entity: str, fmt: str) -> dict:
+    """Import every record in ``stream``; returns counts and the first ``IMPORT_MAX_ERRORS`` row errors."""
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        importer = _Importer(conn, entity)
+    chunk: List[Tuple[int, dict]] = []
+    for line, record, error in read_records(stream, fmt):
+        importer.rows += 1
+        row = None if error else importer.validate(line, record)
+        if error:
+            importer.fail(line, error)
+        if row is not None:
+            chunk.append((line, row))
+        if len(chunk) >= settings.IMPORT_CHUNK_SIZE:
+            importer.insert_chunk(chunk)
+            chunk = []
+    if chunk:
+        importer.insert_chunk(chunk)
+    if importer.inserted and entity in REFERENCE:
+        recheck_version()
+    return {
+        "entity": entity,
+        "format": fmt,
+        "rows": importer.rows,
+        "inserted": importer.inserted,
+        "failed": importer.failed,
+        "errors": importer.errors,
+        "errors_truncated": importer.failed > len(importer.errors),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
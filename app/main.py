@@ -1,10 +1,21 @@
 """FastAPI application factory with router registration."""
-from fastapi import FastAPI
+import logging
+import time
+from contextlib import asynccontextmanager
+
+_imports_started = time.perf_counter()
+
+from fastapi import FastAPI  # noqa: E402 - imports below are timed as a startup phase
 from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
 from app.database import engine, Base
-from app import models  # noqa: F401 - Import to register models with Base
+from app.core.metrics import MetricsMiddleware, STARTUP_PHASES, instrument_engine
+from app.core.profiler import ProfilerMiddleware, profiler, configure_slow_query_log
+from app.core import jobs as job_runner
+from app.core.changes import compact as compact_changes
+from app.core.startup import StartupTimer, ensure_schema, prime_pool, register_warmer, shut_down, warm_up
+from app import analytics, history, models  # noqa: F401 - Import to register models with Base
 
 # Import all routers
 from app.routers import (
@@ -19,14 +30,62 @@ from app.routers import (
     announcements,
     profile,
     dashboard,
+    metrics,
+    debug,
+    jobs,
+    changes,
+    grading,
+    exports,
+    audit,
+    imports,
 )
 
+_imports_finished = time.perf_counter()
+logger = logging.getLogger("app.startup")
+
+
+@register_warmer
+def warm_pool() -> None:
+    """Open pooled connections before the first request needs them."""
+    prime_pool(engine, settings.WARMUP_CONNECTIONS)
+
+
+def prepare_database(timer: StartupTimer) -> None:
+    """Create tables according to SCHEMA_MODE, recording whether DDL ran."""
+    with timer.phase("schema"):
+        if settings.SCHEMA_MODE == "never":
+            return
+        ran_ddl = ensure_schema(engine, Base.metadata, force=settings.SCHEMA_MODE == "always")
+    logger.info("Schema %s", "created/updated" if ran_ddl else "up to date, DDL skipped")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the schema and warm the process before serving requests."""
+    timer: StartupTimer = app.state.startup_timer
+    prepare_database(timer)
+    if settings.WARMUP_ENABLED:
+        warm_up(timer)
+    if settings.CHANGE_LOG_ENABLED:
+        with timer.phase("compact_changes"):
+            compact_changes()
+    for phase, seconds in timer.phases.items():
+        STARTUP_PHASES.set((phase,), seconds)
+    logger.info("Startup phases (ms): %s", timer.report())
+    if settings.JOBS_ENABLED:
+        job_runner.recover()
+    if settings.DASHBOARD_HISTORY_ENABLED:
+        history.start_snapshotter()
+    analytics.start_refresher()
+    yield
+    shut_down()
+
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
-    
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
+    timer = StartupTimer()
+    timer.record("imports", _imports_finished - _imports_started)
+    started = time.perf_counter()
     
     # Initialize FastAPI app
     app = FastAPI(
@@ -35,7 +94,22 @@ def create_app() -> FastAPI:
         version=settings.APP_VERSION,
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
+    app.state.startup_timer = timer
+    
+    # Instrumentation
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine)
+        app.add_middleware(MetricsMiddleware)
+    if settings.PROFILER_ENABLED:
+        configure_slow_query_log(
+            settings.SLOW_QUERY_LOG,
+            settings.SLOW_QUERY_LOG_MAX_BYTES,
+            settings.SLOW_QUERY_LOG_BACKUPS,
+        )
+        profiler.instrument(engine)
+        app.add_middleware(ProfilerMiddleware, profiler=profiler)
     
     # Mount static files
     app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -52,7 +126,21 @@ def create_app() -> FastAPI:
     app.include_router(announcements.router)
     app.include_router(profile.router)
     app.include_router(dashboard.router)
+    app.include_router(grading.router)
+    app.include_router(imports.router)
+    if settings.AUDIT_ENABLED:
+        app.include_router(audit.router)
+    if settings.JOBS_ENABLED:
+        app.include_router(jobs.router)
+        app.include_router(exports.router)
+    if settings.CHANGE_LOG_ENABLED:
+        app.include_router(changes.router)
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics.router)
+    if settings.PROFILER_ENABLED:
+        app.include_router(debug.router)
     
+    timer.record("create_app", time.perf_counter() - started)
     return app
 
 
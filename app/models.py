@@ -1,6 +1,6 @@
 """SQLAlchemy models for the Student Management System."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, Date, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Date, Boolean, DateTime, Text, Index, LargeBinary
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -66,6 +66,11 @@ class Result(Base):
     student_rel = relationship("Student")
     subject_rel = relationship("Subject")
 
+    __table_args__ = (
+        # One result per student and subject; /results/bulk upserts on it.
+        Index("uq_results_student_subject", "student_id", "subject_id", unique=True),
+    )
+
 
 class Fee(Base):
     __tablename__ = "fees"
@@ -113,3 +118,127 @@ class Announcement(Base):
     priority = Column(String, default="normal")
     posted_by = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, index=True)
+    status = Column(String, default="queued", index=True)
+    params = Column(Text, default="{}")
+    progress = Column(Float, default=0.0)
+    message = Column(String, default="")
+    result = Column(Text)
+    result_path = Column(String)
+    error = Column(Text)
+    created_by = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+    # AUTOINCREMENT keeps sequence numbers monotonic after compaction deletes.
+    __table_args__ = (
+        Index("ix_change_log_row", "table_name", "row_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = Column(Integer, primary_key=True)
+    table_name = Column(String)
+    row_id = Column(Integer)
+    op = Column(String)
+    data = Column(Text)
+    changed_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class ChangeFeedState(Base):
+    __tablename__ = "change_feed_state"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, default=0)
+
+
+class GradingPolicy(Base):
+    __tablename__ = "grading_policies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True)
+    # NULL applies to every department without a policy of its own.
+    department_id = Column(Integer, ForeignKey("departments.id"), unique=True, nullable=True)
+    bands = Column(Text)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DashboardSnapshot(Base):
+    __tablename__ = "dashboard_snapshots"
+    __table_args__ = (
+        Index("uq_dashboard_snapshot", "department_id", "taken_at", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # Aligned to DASHBOARD_SNAPSHOT_INTERVAL; the unique index lets only one worker record each tick.
+    taken_at = Column(DateTime, nullable=False)
+    # 0 is the campus-wide row (it also counts students without a department).
+    department_id = Column(Integer, nullable=False)
+    departments = Column(Integer)
+    students = Column(Integer)
+    subjects = Column(Integer)
+    paid_fees = Column(Integer)
+    unpaid_fees = Column(Integer)
+    cleared_students = Column(Integer)
+    results = Column(Integer)
+    average_gpa = Column(Float)
+
+
+class AuditEvent(Base):
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_entity", "entity", "entity_id", "id"),
+        Index("ix_audit_actor", "actor", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    occurred_at = Column(DateTime, index=True)
+    actor = Column(String)
+    action = Column(String)
+    entity = Column(String)
+    entity_id = Column(Integer)
+    # JSON: {column: [old, new]} for updates, the row's values otherwise
+    changes = Column(Text)
+
+
+class SemesterRollover(Base):
+    __tablename__ = "semester_rollovers"
+
+    id = Column(Integer, primary_key=True)
+    actor = Column(String)
+    # NULL filters mean every department / every semester.
+    department_id = Column(Integer, nullable=True)
+    from_semester = Column(Integer, nullable=True)
+    promoted = Column(Integer, default=0)
+    # Students already in the final semester, left where they are.
+    held_back = Column(Integer, default=0)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    # NULL while running, or if the rollover stopped part way.
+    finished_at = Column(DateTime, nullable=True)
+
+
+class ResultPublication(Base):
+    __tablename__ = "result_publications"
+    __table_args__ = (
+        Index("uq_result_publication", "student_id", "semester", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
+    semester = Column(Integer, nullable=False)
+    gpa = Column(Float)
+    # sha256 of the document without published_at; a republish skips unchanged rows.
+    checksum = Column(String)
+    # gzip-compressed JSON, served as-is to clients that accept gzip
+    payload = Column(LargeBinary)
+    published_at = Column(DateTime)
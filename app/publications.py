@@ -0,0 +1,184 @@
+"""Frozen result publications: one pre-serialized document per cleared student and semester.
+
+``publish`` streams the results of every fully cleared student in scope,
+groups them by subject semester, computes the GPA with the department's
+grading policy and stores the JSON document gzip-compressed in
+``result_publications``, keyed by (student_id, semester). Documents whose
+content did not change are left alone; publications in scope whose student
+is no longer cleared (or has no results there) are withdrawn. Only the
+keys actually written or withdrawn are evicted from the cache.
+
+Reads never touch results or clearances: a cache hit, or else one unique
+index lookup. Misses are cached too, since students who are not cleared keep
+asking on publication day. With the in-process cache backend other workers
+may serve the previous document until ``PUBLICATION_CACHE_TTL`` expires.
+"""
+import gzip
+import hashlib
+import json
+from datetime import datetime
+from itertools import groupby
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.core.bulk import chunked, upsert
+from app.core.cache import get_cache
+from app.core.refdata import reference_data
+from app.database import engine
+
+
+_RESULT_FIELDS = ("id", "student_id", "subject_id", "midterm_marks", "final_marks", "sessional_marks", "total_marks")
+# Cached for students without a publication, so repeated misses skip the database too.
+_UNPUBLISHED = b""
+
+
+def _cache():
+    return get_cache("publications", maxsize=settings.PUBLICATION_CACHE_SIZE)
+
+
+def _cleared_students():
+    clearance = models.Clearance
+    # Uncorrelated, so the database builds the cleared set once rather than probing per result.
+    return select(clearance.student_id).where(
+        clearance.library_clearance == True,
+        clearance.finance_clearance == True,
+        clearance.hostel_clearance == True,
+        clearance.department_clearance == True,
+    )
+
+
+def _scope(query, department_id: Optional[int], semester: Optional[int], semester_column):
+    if department_id is not None:
+        query = query.where(models.Student.department_id == department_id)
+    if semester is not None:
+        query = query.where(semester_column == semester)
+    return query
+
+
+def _documents(db: Session, department_id: Optional[int], semester: Optional[int]) -> Iterator[dict]:
+    """Yield one publication row (payload compressed) per cleared student and semester."""
+    result = models.Result.__table__.c
+    query = _scope(
+        select(models.Student.department_id, models.Subject.semester, *(result[name] for name in _RESULT_FIELDS))
+        .join(models.Student, models.Student.id == result.student_id)
+        .join(models.Subject, models.Subject.id == result.subject_id)
+        .where(result.student_id.in_(_cleared_students()))
+        .order_by(result.student_id, models.Subject.semester, result.id),
+        department_id, semester, models.Subject.semester,
+    )
+    snapshot = reference_data(db)
+    published_at = datetime.utcnow()
+    with engine.connect() as conn:
+        rows = conn.execution_options(yield_per=5000).execute(query)
+        for (student_id, subject_semester), group in groupby(rows, key=lambda row: (row.student_id, row.semester)):
+            group = list(group)
+            policy = snapshot.policy_for(group[0].department_id)
+            document = {
+                "student_id": student_id,
+                "semester": subject_semester,
+                "gpa": round(policy.mean([row.total_marks for row in group]), 2),
+                "results": [{name: row._mapping[name] for name in _RESULT_FIELDS} for row in group],
+            }
+            checksum = hashlib.sha256(json.dumps(document, separators=(",", ":")).encode()).hexdigest()
+            document["published_at"] = published_at.isoformat() + "Z"
+            yield {
+                "student_id": student_id,
+                "semester": subject_semester,
+                "gpa": document["gpa"],
+                "checksum": checksum,
+                "payload": gzip.compress(json.dumps(document, separators=(",", ":")).encode(), mtime=0),
+                "published_at": published_at,
+            }
+
+
+def _write(batch: List[dict]) -> int:
+    """Upsert the documents in ``batch`` that changed; returns how many were written."""
+    table = models.ResultPublication.__table__
+    with engine.begin() as conn:
+        current = {
+            (row.student_id, row.semester): row.checksum
+            for row in conn.execute(
+                select(table.c.student_id, table.c.semester, table.c.checksum).where(
+                    table.c.student_id.in_({doc["student_id"] for doc in batch}),
+                    table.c.semester.in_({doc["semester"] for doc in batch}),
+                )
+            )
+        }
+        changed = [doc for doc in batch if current.get((doc["student_id"], doc["semester"])) != doc["checksum"]]
+        upsert(conn, table, changed, ("student_id", "semester"), ("id",))
+    _evict((doc["student_id"], doc["semester"]) for doc in changed)
+    return len(changed)
+
+
+def _evict(keys) -> None:
+    cache = _cache()
+    for student_id, semester in keys:
+        cache.invalidate((student_id, semester))
+        cache.invalidate((student_id, None))
+
+
+def publish(db: Session, department_id: Optional[int] = None, semester: Optional[int] = None) -> Dict[str, int]:
+    """Freeze results of cleared students in scope; returns counts written, unchanged and withdrawn."""
+    seen: Set[Tuple[int, int]] = set()
+    written = unchanged = 0
+    batch: List[dict] = []
+    for doc in _documents(db, department_id, semester):
+        seen.add((doc["student_id"], doc["semester"]))
+        batch.append(doc)
+        if len(batch) >= settings.PUBLICATION_BATCH_SIZE:
+            count = _write(batch)
+            written, unchanged = written + count, unchanged + len(batch) - count
+            batch = []
+    if batch:
+        count = _write(batch)
+        written, unchanged = written + count, unchanged + len(batch) - count
+
+    publication = models.ResultPublication.__table__.c
+    with engine.connect() as conn:
+        stale = [
+            (row.id, row.student_id, row.semester)
+            for row in conn.execute(_scope(
+                select(publication.id, publication.student_id, publication.semester)
+                .join(models.Student, models.Student.id == publication.student_id),
+                department_id, semester, publication.semester,
+            ))
+            if (row.student_id, row.semester) not in seen
+        ]
+    for chunk in chunked(stale, 1000):
+        with engine.begin() as conn:
+            conn.execute(delete(models.ResultPublication).where(publication.id.in_([id_ for id_, _, _ in chunk])))
+    _evict((student_id, semester) for _, student_id, semester in stale)
+    return {"published": written, "unchanged": unchanged, "withdrawn": len(stale)}
+
+
+def lookup(db: Session, student_id: int, semester: int) -> Optional[bytes]:
+    """The gzip-compressed document for one student and semester, or None if unpublished."""
+    cache = _cache()
+    key = (student_id, semester)
+    payload = cache.get(key)
+    if payload is None:
+        table = models.ResultPublication
+        payload = db.execute(
+            select(table.payload).where(table.student_id == student_id, table.semester == semester)
+        ).scalar() or _UNPUBLISHED
+        cache.set(key, payload, ttl=settings.PUBLICATION_CACHE_TTL or None)
+    return payload or None
+
+
+def lookup_all(db: Session, student_id: int) -> Optional[bytes]:
+    """Every published semester for a student as one JSON array (uncompressed), or None."""
+    cache = _cache()
+    key = (student_id, None)
+    body = cache.get(key)
+    if body is None:
+        table = models.ResultPublication
+        payloads = db.execute(
+            select(table.payload).where(table.student_id == student_id).order_by(table.semester)
+        ).scalars().all()
+        body = b"[" + b",".join(gzip.decompress(payload) for payload in payloads) + b"]" if payloads else _UNPUBLISHED
+        cache.set(key, body, ttl=settings.PUBLICATION_CACHE_TTL or None)
+    return body or None
@@ -0,0 +1,192 @@
+"""Long-running report and maintenance jobs executed by the background job runner."""
+import csv
+import io
+import zipfile
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import func, select
+
+from app import analytics, columnar, history, models, publications
+from app.core.changes import compact
+from app.core.jobs import JobContext, register_job
+from app.core.refdata import load_snapshot
+from app.database import SessionLocal, engine
+
+
+_EXPORT_TABLES = {
+    "departments": models.Department,
+    "subjects": models.Subject,
+    "students": models.Student,
+    "results": models.Result,
+    "fees": models.Fee,
+    "clearances": models.Clearance,
+}
+
+
+def _stream_rows(conn, table):
+    return conn.execution_options(yield_per=5000).execute(select(table).order_by(table.c.id))
+
+
+@register_job("campus_export")
+def campus_export(ctx: JobContext) -> dict:
+    """Zip one CSV per table, streaming rows so memory stays flat."""
+    path = ctx.output_path("campus_export.zip")
+    counts = {}
+    with engine.connect() as conn:
+        totals = {
+            name: conn.execute(select(func.count()).select_from(model.__table__)).scalar() or 0
+            for name, model in _EXPORT_TABLES.items()
+        }
+        grand_total = sum(totals.values()) or 1
+        done = 0
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, model in _EXPORT_TABLES.items():
+                table = model.__table__
+                with archive.open(f"{name}.csv", "w") as raw:
+                    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                    writer = csv.writer(text)
+                    writer.writerow(table.columns.keys())
+                    counts[name] = 0
+                    for row in _stream_rows(conn, table):
+                        writer.writerow(row)
+                        counts[name] += 1
+                        done += 1
+                        if done % 5000 == 0:
+                            ctx.progress(done / grand_total, f"Exporting {name}")
+                    text.flush()
+                    text.detach()
+    return {"path": path, "rows": counts}
+
+
+def _semester_points(conn, department_id: Optional[int], semester: Optional[int]):
+    """Aggregate grade points per (student, semester) in one streamed pass."""
+    policy_for = load_snapshot(conn).policy_for
+    query = (
+        select(
+            models.Result.student_id,
+            models.Student.department_id,
+            models.Subject.semester,
+            models.Result.total_marks,
+        )
+        .join(models.Subject, models.Subject.id == models.Result.subject_id)
+        .join(models.Student, models.Student.id == models.Result.student_id)
+    )
+    if department_id is not None:
+        query = query.where(models.Student.department_id == department_id)
+    if semester is not None:
+        query = query.where(models.Subject.semester == semester)
+    points = defaultdict(lambda: [0.0, 0])
+    rows = conn.execution_options(yield_per=10000).execute(query)
+    for student_id, dept_id, subject_semester, total_marks in rows:
+        entry = points[(student_id, subject_semester)]
+        entry[0] += policy_for(dept_id).point(total_marks)
+        entry[1] += 1
+    return points
+
+
+@register_job("cohort_gpa")
+def cohort_gpa(ctx: JobContext, department_id: Optional[int] = None, semester: Optional[int] = None) -> dict:
+    """Recompute semester GPA for every student in a cohort."""
+    ctx.progress(0.0, "Loading results", force=True)
+    with engine.connect() as conn:
+        points = _semester_points(conn, department_id, semester)
+    ctx.progress(0.5, "Writing GPA report", force=True)
+
+    path = ctx.output_path("cohort_gpa.csv")
+    students = set()
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["student_id", "semester", "subjects", "gpa"])
+        for (student_id, subject_semester), (total, count) in sorted(points.items()):
+            writer.writerow([student_id, subject_semester, count, round(total / count, 2)])
+            students.add(student_id)
+    return {"path": path, "students": len(students), "rows": len(points)}
+
+
+@register_job("rankings")
+def rankings(ctx: JobContext, department_id: Optional[int] = None) -> dict:
+    """Rebuild CGPA rankings within each department."""
+    ctx.progress(0.0, "Loading results", force=True)
+    with engine.connect() as conn:
+        points = _semester_points(conn, department_id, None)
+        query = select(models.Student.id, models.Student.roll_no, models.Student.name, models.Student.department_id)
+        if department_id is not None:
+            query = query.where(models.Student.department_id == department_id)
+        students = {row.id: row for row in conn.execute(query)}
+    ctx.progress(0.6, "Ranking students", force=True)
+
+    cumulative = defaultdict(lambda: [0.0, 0])
+    for (student_id, _), (total, count) in points.items():
+        cumulative[student_id][0] += total
+        cumulative[student_id][1] += count
+
+    by_department = defaultdict(list)
+    for student_id, (total, count) in cumulative.items():
+        student = students.get(student_id)
+        if student is not None:
+            by_department[student.department_id].append((round(total / count, 2), student))
+
+    path = ctx.output_path("rankings.csv")
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["department_id", "rank", "student_id", "roll_no", "name", "cgpa"])
+        for dept_id in sorted(by_department, key=lambda d: (d is None, d)):
+            ranked = sorted(by_department[dept_id], key=lambda item: (-item[0], item[1].roll_no or ""))
+            rank = 0
+            previous = None
+            for position, (cgpa, student) in enumerate(ranked, start=1):
+                if cgpa != previous:
+                    rank, previous = position, cgpa
+                writer.writerow([dept_id, rank, student.id, student.roll_no, student.name, cgpa])
+    return {"path": path, "departments": len(by_department), "students": len(cumulative)}
+
+
+@register_job("compact_change_log")
+def compact_change_log(ctx: JobContext, retention_days: Optional[int] = None) -> dict:
+    """Coalesce and trim the change feed outside the startup path."""
+    return compact(retention_days)
+
+
+@register_job("columnar_export")
+def columnar_export(ctx: JobContext, format: str = "arrow", full: bool = False) -> dict:
+    """Export analytics tables as Arrow/Parquet, incrementally since the last export."""
+    with engine.connect() as conn:
+        manifest = columnar.export_snapshot(conn, format, full, ctx.progress)
+    with engine.begin() as conn:
+        columnar.save_cursor(conn, manifest["through_seq"])
+    return {
+        "export_id": manifest["export_id"],
+        "mode": manifest["mode"],
+        "rows": {f"{entry['table']}:{entry['kind']}": entry["rows"] for entry in manifest["files"]},
+    }
+
+
+@register_job("analytics_snapshot")
+def analytics_snapshot(ctx: JobContext, full: bool = False) -> dict:
+    """Refresh (or with ``full``, rebuild and compact) the mmap'd analytics snapshot."""
+    if not analytics.available():
+        raise RuntimeError("Analytics snapshot needs numpy and ANALYTICS_ENABLED")
+    snapshot = analytics.refresh(full=full)
+    return {"generation": snapshot.generation, "rows": snapshot.rows, "through_seq": snapshot.through_seq}
+
+
+@register_job("dashboard_snapshot")
+def dashboard_snapshot(ctx: JobContext) -> dict:
+    """Record the current dashboard history tick now instead of waiting for the snapshotter."""
+    db = SessionLocal()
+    try:
+        tick = history.take_snapshot(db)
+    finally:
+        db.close()
+    return {"taken_at": tick.isoformat() + "Z" if tick else None}
+
+
+@register_job("publish_results")
+def publish_results(ctx: JobContext, department_id: Optional[int] = None, semester: Optional[int] = None) -> dict:
+    """Freeze cleared students' results into publication documents (see app.publications)."""
+    db = SessionLocal()
+    try:
+        return publications.publish(db, department_id, semester)
+    finally:
+        db.close()
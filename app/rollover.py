@@ -0,0 +1,90 @@
+"""Term-end semester rollover: promote whole cohorts with set-based UPDATEs.
+
+Matching students are walked in id order, ``ROLLOVER_CHUNK_SIZE`` at a time,
+and each chunk is one ``UPDATE ... SET semester = semester + 1`` in its own
+short transaction, appended to the change feed. Keyset paging means every
+student is promoted at most once per run even without a semester filter.
+Students already in ``FINAL_SEMESTER`` are held back. Each run leaves a
+``semester_rollovers`` row (audited), written before the first chunk and
+completed after the last, so a run that stopped part way shows up with no
+``finished_at``.
+"""
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.core.changes import record_changes
+from app.database import engine
+
+
+def _filters(department_id: Optional[int], semester: Optional[int]) -> list:
+    student = models.Student.__table__.c
+    filters = []
+    if department_id is not None:
+        filters.append(student.department_id == department_id)
+    if semester is not None:
+        filters.append(student.semester == semester)
+    return filters
+
+
+def preview(db: Session, department_id: Optional[int] = None, semester: Optional[int] = None) -> dict:
+    """How many students a rollover would promote and hold back, without changing anything."""
+    student = models.Student.__table__.c
+    final = student.semester >= settings.FINAL_SEMESTER
+    held_back, matched = db.execute(
+        select(func.count().filter(final), func.count()).where(*_filters(department_id, semester))
+    ).one()
+    return {"promoted": matched - held_back, "held_back": held_back}
+
+
+def _promote_chunk(after_id: int, filters: list) -> Optional[Tuple[int, int]]:
+    """Promote the next chunk after ``after_id``; returns its last id and how many moved up."""
+    table = models.Student.__table__
+    below_final = table.c.semester < settings.FINAL_SEMESTER
+    with engine.begin() as conn:
+        ids = conn.execute(
+            select(table.c.id)
+            .where(table.c.id > after_id, below_final, *filters)
+            .order_by(table.c.id)
+            .limit(settings.ROLLOVER_CHUNK_SIZE)
+        ).scalars().all()
+        if not ids:
+            return None
+        # Re-check the filters so rows changed since the SELECT are left alone.
+        rows = conn.execute(
+            update(table)
+            .where(table.c.id.in_(ids), below_final, *filters)
+            .values(semester=table.c.semester + 1)
+            .returning(*table.c)
+        ).mappings().all()
+        record_changes(conn, table.name, "update", [dict(row) for row in rows])
+    return ids[-1], len(rows)
+
+
+def run(db: Session, actor: Optional[str], department_id: Optional[int] = None,
+        semester: Optional[int] = None) -> models.SemesterRollover:
+    """Promote every matching student below the final semester; returns the summary record."""
+    summary = models.SemesterRollover(actor=actor, department_id=department_id, from_semester=semester)
+    summary.held_back = preview(db, department_id, semester)["held_back"]
+    db.add(summary)
+    db.commit()
+    db.refresh(summary)
+
+    filters = _filters(department_id, semester)
+    after_id, promoted = 0, 0
+    while True:
+        chunk = _promote_chunk(after_id, filters)
+        if chunk is None:
+            break
+        after_id, count = chunk
+        promoted += count
+
+    summary.promoted = promoted
+    summary.finished_at = datetime.utcnow()
+    db.commit()
+    db.refresh(summary)
+    return summary
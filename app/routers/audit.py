@@ -0,0 +1,67 @@
+"""Audit trail routes (admin only)."""
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.config import settings
+from app.core.audit import AUDITED
+from app.core.security import require_role
+from app.database import SessionRoute, get_db
+
+router = APIRouter(prefix="/audit", tags=["Audit"], route_class=SessionRoute)
+
+
+@router.get("/", response_model=List[schemas.AuditEventResponse])
+def list_audit_events(
+    entity: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    actor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Audit events, newest first (admin only).
+
+    Filter by ``entity`` (optionally with ``entity_id``) and/or ``actor``;
+    page with ``before_id`` set to the last id of the previous page. Events
+    are written behind, so the newest few may take up to
+    ``AUDIT_FLUSH_INTERVAL`` seconds to appear.
+    """
+    if entity is not None and entity not in AUDITED:
+        raise HTTPException(status_code=400, detail=f"Unknown entity; use one of {', '.join(AUDITED)}")
+    if entity_id is not None and entity is None:
+        raise HTTPException(status_code=400, detail="entity_id requires entity")
+    audit = models.AuditEvent
+    query = select(audit).order_by(audit.id.desc()).limit(max(1, min(limit, settings.AUDIT_PAGE_SIZE)))
+    if entity is not None:
+        query = query.where(audit.entity == entity)
+    if entity_id is not None:
+        query = query.where(audit.entity_id == entity_id)
+    if actor is not None:
+        query = query.where(audit.actor == actor)
+    if since is not None:
+        query = query.where(audit.occurred_at >= since)
+    if until is not None:
+        query = query.where(audit.occurred_at < until)
+    if before_id is not None:
+        query = query.where(audit.id < before_id)
+    return [
+        schemas.AuditEventResponse(
+            id=event.id,
+            occurred_at=event.occurred_at,
+            actor=event.actor,
+            action=event.action,
+            entity=event.entity,
+            entity_id=event.entity_id,
+            changes=json.loads(event.changes) if event.changes else {},
+        )
+        for event in db.execute(query).scalars()
+    ]
@@ -3,10 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app import models, schemas
-from app.database import get_db
+from app.database import SessionRoute, get_db
+from app.core.limits import throttle_login
 from app.core.security import hash_password, verify_password, create_access_token
 
-router = APIRouter(prefix="", tags=["Authentication"])
+router = APIRouter(prefix="", tags=["Authentication"], route_class=SessionRoute)
 
 
 @router.post("/signup")
@@ -25,7 +26,7 @@ def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
     return {"message": "User registered successfully"}
 
 
-@router.post("/login", response_model=schemas.Token)
+@router.post("/login", response_model=schemas.Token, dependencies=[Depends(throttle_login)])
 def login(user: schemas.UserLogin, db: Session = Depends(get_db)):
     """Authenticate user and return JWT token."""
     db_user = db.query(models.User).filter(models.User.email == user.email).first()
@@ -0,0 +1,43 @@
+"""Change feed routes for incremental client sync."""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.core import changes
+from app.core.expand import parse_names
+from app.core.security import get_current_user
+from app.database import SessionRoute, get_db
+
+router = APIRouter(prefix="/changes", tags=["Changes"], route_class=SessionRoute)
+
+
+@router.get("/")
+def get_changes(
+    since: int = 0,
+    tables: Optional[str] = None,
+    limit: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Get inserts, updates and deletes after sequence number ``since``.
+
+    Pass the returned ``last_seq`` as the next ``since``; keep paging while
+    ``has_more`` is true. 410 means the cursor predates compaction and the
+    client must reload full lists and then resume from ``last_seq``.
+    """
+    names = parse_names(tables, changes.TRACKED, "tables") or None
+    conn = db.connection()
+    trimmed = changes.watermark(conn)
+    if since < trimmed:
+        raise HTTPException(
+            status_code=410,
+            detail={
+                "message": "Changes before this cursor were compacted; reload and resume from last_seq",
+                "last_seq": changes.latest_seq(conn),
+            },
+        )
+    page = min(limit or settings.CHANGE_FEED_PAGE_SIZE, settings.CHANGE_FEED_PAGE_SIZE)
+    return changes.read_changes(conn, since, names, page)
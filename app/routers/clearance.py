@@ -3,10 +3,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app import models, schemas
-from app.database import get_db
+from app.database import SessionRoute, get_db
 from app.core.security import get_current_user, require_role
 
-router = APIRouter(prefix="/clearance", tags=["Clearance"])
+router = APIRouter(prefix="/clearance", tags=["Clearance"], route_class=SessionRoute)
 
 
 @router.post("/", response_model=schemas.ClearanceResponse)
@@ -1,15 +1,31 @@
 """Dashboard and analytics routes."""
-from fastapi import APIRouter, Depends
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app import models
-from app.database import get_db
-from app.core.security import get_current_user, calculate_grade_point
+from app import analytics, history, models
+from app.config import settings
+from app.database import SessionRoute, get_db
+from app.core.limits import admission
+from app.core.refdata import reference_data
+from app.core.security import get_current_user
+
+router = APIRouter(tags=["Dashboard"], route_class=SessionRoute)
+
 
-router = APIRouter(tags=["Dashboard"])
+def _average_gpa(db: Session) -> float:
+    """Campus average GPA from SQL, used when the analytics snapshot is unavailable."""
+    totals = history.gpa_points_by_department(db).values()
+    result_count = sum(count for _, count in totals)
+    if not result_count:
+        return 0.0
+    return round(sum(points for points, _ in totals) / result_count, 2)
 
 
-@router.get("/dashboard/")
+@router.get("/dashboard/", dependencies=[Depends(admission("heavy"))])
 def get_dashboard(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
@@ -31,13 +47,11 @@ def get_dashboard(
     
     not_cleared_students = db.query(models.Student).count() - cleared_students
     
-    # Average GPA
-    results = db.query(models.Result).all()
-    if results:
-        total_points = sum(calculate_grade_point(r.total_marks) for r in results)
-        avg_gpa = round(total_points / len(results), 2)
+    snapshot = analytics.current()
+    if snapshot is not None:
+        avg_gpa = analytics.cohort_stats(snapshot, reference_data(db).policy_for)["average_gpa"]
     else:
-        avg_gpa = 0.0
+        avg_gpa = _average_gpa(db)
     
     return {
         "total_students": total_students,
@@ -55,6 +69,69 @@ def get_dashboard(
     }
 
 
+@router.get("/dashboard/statistics", dependencies=[Depends(admission("heavy"))])
+def get_cohort_statistics(
+    department_id: Optional[int] = None,
+    semester: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Result statistics (averages, grade distribution, percentiles) for a cohort."""
+    snapshot = analytics.current()
+    if snapshot is None:
+        raise HTTPException(
+            status_code=503, detail="Analytics snapshot unavailable (requires numpy, or the first build is running)"
+        )
+    return analytics.cohort_stats(snapshot, reference_data(db).policy_for, department_id, semester)
+
+
+def _utc(value: datetime) -> datetime:
+    """Naive UTC, the form snapshot times are stored in."""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+@router.get("/dashboard/history")
+def get_dashboard_history(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    step: Optional[str] = None,
+    department_id: int = history.CAMPUS,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Dashboard figures over time (UTC), downsampled to one point per ``step``.
+
+    Defaults to the last seven days, at the snapshot interval or the
+    coarsest step that fits ``DASHBOARD_HISTORY_MAX_POINTS``. Reads only the
+    stored snapshots, never the live tables.
+    """
+    end = _utc(end) if end else datetime.utcnow()
+    start = _utc(start) if start else end - timedelta(days=7)
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    span = (end - start).total_seconds()
+    if step is None:
+        interval = settings.DASHBOARD_SNAPSHOT_INTERVAL
+        step_seconds = interval * max(1, math.ceil(span / settings.DASHBOARD_HISTORY_MAX_POINTS / interval))
+    else:
+        try:
+            step_seconds = history.parse_step(step)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    if span / step_seconds > settings.DASHBOARD_HISTORY_MAX_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large for step; at most {settings.DASHBOARD_HISTORY_MAX_POINTS} points",
+        )
+    return {
+        "from": start.isoformat() + "Z",
+        "to": end.isoformat() + "Z",
+        "step": step_seconds,
+        "department_id": department_id,
+        "points": history.history(db, start, end, step_seconds, department_id),
+    }
+
+
 @router.get("/teachers/")
 def get_teachers(
     db: Session = Depends(get_db),
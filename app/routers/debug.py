@@ -0,0 +1,41 @@
+"""Debug routes: request SQL profiles (admin only, enabled with PROFILER_ENABLED)."""
+from fastapi import APIRouter, Depends, HTTPException
+
+from app import models
+from app.core.profiler import profiler
+from app.core.security import require_role
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+@router.get("/profile")
+def get_profiles(
+    limit: int = 50,
+    n_plus_one: bool = False,
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """List recent request profiles, newest first (admin only)."""
+    return {
+        "slow_query_ms": profiler.slow_query_ms,
+        "n_plus_one_threshold": profiler.n_plus_one_threshold,
+        "profiles": profiler.recent(limit=limit, n_plus_one_only=n_plus_one),
+    }
+
+
+@router.get("/profile/{profile_id}")
+def get_profile(
+    profile_id: int,
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Get every statement recorded for one request (admin only)."""
+    profile = profiler.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@router.delete("/profile")
+def clear_profiles(current_user: models.User = Depends(require_role("admin"))):
+    """Discard recorded profiles (admin only)."""
+    profiler.clear()
+    return {"message": "Profiles cleared"}
@@ -1,13 +1,15 @@
 """Department routes."""
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app import models, schemas
-from app.database import get_db
+from app.database import SessionRoute, get_db
+from app.core.expand import parse_fields, shaped
+from app.core.refdata import reference_data
 from app.core.security import get_current_user, require_role
 
-router = APIRouter(prefix="/departments", tags=["Departments"])
+router = APIRouter(prefix="/departments", tags=["Departments"], route_class=SessionRoute)
 
 
 @router.post("/", response_model=schemas.DepartmentResponse)
@@ -26,11 +28,13 @@ def create_department(
 
 @router.get("/", response_model=List[schemas.DepartmentResponse])
 def get_departments(
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    """Get all departments."""
-    return db.query(models.Department).all()
+    """Get all departments; ``fields`` picks columns."""
+    columns = parse_fields(fields, schemas.DepartmentResponse)
+    return shaped(reference_data(db).departments, schemas.DepartmentResponse, columns)
 
 
 @router.get("/{department_id}", response_model=schemas.DepartmentResponse)
@@ -40,7 +44,7 @@ def get_department(
     current_user: models.User = Depends(get_current_user)
 ):
     """Get a specific department by ID."""
-    dept = db.query(models.Department).filter(models.Department.id == department_id).first()
+    dept = reference_data(db).department(department_id)
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
     return dept
@@ -0,0 +1,56 @@
+"""Columnar export routes: trigger, list manifests and download files (admin only)."""
+import os
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app import columnar, models, schemas
+from app.config import settings
+from app.core import jobs
+from app.core.security import require_role
+from app.database import SessionRoute, get_db
+from app.routers.jobs import _to_response
+
+router = APIRouter(prefix="/exports", tags=["Exports"], route_class=SessionRoute)
+
+_MEDIA_TYPES = {
+    ".arrow": "application/vnd.apache.arrow.file",
+    ".parquet": "application/vnd.apache.parquet",
+    ".json": "application/json",
+}
+
+
+@router.post("/", response_model=schemas.JobResponse, status_code=202)
+def start_export(
+    format: str = "arrow",
+    full: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Queue a columnar export; incremental unless ``full`` (admin only)."""
+    if format not in columnar.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format; use one of {', '.join(columnar.FORMATS)}")
+    job = jobs.submit(db, "columnar_export", {"format": format, "full": full}, current_user.email)
+    return _to_response(job)
+
+
+@router.get("/")
+def list_exports(current_user: models.User = Depends(require_role("admin"))):
+    """List export manifests, newest first (admin only)."""
+    return columnar.list_exports()
+
+
+@router.get("/{export_id}/{filename}")
+def download_export_file(
+    export_id: str,
+    filename: str,
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Download a manifest or data file of an export (admin only)."""
+    root = os.path.realpath(settings.EXPORTS_DIR)
+    path = os.path.realpath(os.path.join(root, export_id, filename))
+    if not path.startswith(root + os.sep) or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Export file not found")
+    media_type = _MEDIA_TYPES.get(os.path.splitext(path)[1], "application/octet-stream")
+    return FileResponse(path, media_type=media_type, filename=filename)
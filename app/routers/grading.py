@@ -0,0 +1,88 @@
+"""Grading policy routes: per-department grade point scales."""
+import json
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.core.grading import DEFAULT_BANDS, CompiledPolicy
+from app.core.security import get_current_user, require_role
+from app.database import SessionRoute, get_db
+
+router = APIRouter(prefix="/grading-policies", tags=["Grading"], route_class=SessionRoute)
+
+
+def _to_response(policy: models.GradingPolicy) -> schemas.GradingPolicyResponse:
+    return schemas.GradingPolicyResponse(
+        id=policy.id,
+        name=policy.name,
+        department_id=policy.department_id,
+        bands=json.loads(policy.bands),
+    )
+
+
+@router.get("/", response_model=List[schemas.GradingPolicyResponse])
+def get_policies(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Get all stored grading policies."""
+    return [_to_response(p) for p in db.query(models.GradingPolicy).order_by(models.GradingPolicy.id)]
+
+
+@router.get("/default")
+def get_default_policy(current_user: models.User = Depends(get_current_user)):
+    """Get the built-in scale used when no policy applies."""
+    return {"bands": [{"min_marks": low, "points": points} for low, points in DEFAULT_BANDS]}
+
+
+@router.put("/", response_model=schemas.GradingPolicyResponse)
+def save_policy(
+    policy: schemas.GradingPolicyCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Create or replace the policy with this name (admin only).
+
+    A policy without ``department_id`` becomes the campus-wide default.
+    """
+    bands = [band.model_dump() for band in policy.bands]
+    try:
+        CompiledPolicy((b["min_marks"], b["points"]) for b in bands)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if policy.department_id is not None and not db.get(models.Department, policy.department_id):
+        raise HTTPException(status_code=404, detail="Department not found")
+
+    existing = db.query(models.GradingPolicy).filter(models.GradingPolicy.name == policy.name).first()
+    clash = db.query(models.GradingPolicy).filter(
+        models.GradingPolicy.department_id.is_(None) if policy.department_id is None
+        else models.GradingPolicy.department_id == policy.department_id,
+        models.GradingPolicy.name != policy.name,
+    ).first()
+    if clash:
+        raise HTTPException(status_code=400, detail=f"Policy '{clash.name}' already covers this department")
+
+    record = existing or models.GradingPolicy(name=policy.name)
+    record.department_id = policy.department_id
+    record.bands = json.dumps(bands)
+    db.add(record)
+    db.commit()
+    db.refresh(record)
+    return _to_response(record)
+
+
+@router.delete("/{policy_id}")
+def delete_policy(
+    policy_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Delete a grading policy (admin only); affected departments fall back to the default."""
+    policy = db.get(models.GradingPolicy, policy_id)
+    if not policy:
+        raise HTTPException(status_code=404, detail="Grading policy not found")
+    db.delete(policy)
+    db.commit()
+    return {"message": "Grading policy deleted"}
@@ -0,0 +1,38 @@
+"""Bulk import routes: stream CSV or NDJSON uploads into departments, subjects and students (admin only)."""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+
+from app import imports, models, schemas
+from app.core.limits import admission
+from app.core.security import require_role
+from app.database import SessionRoute, get_db, release_session
+
+router = APIRouter(prefix="/imports", tags=["Imports"], route_class=SessionRoute)
+
+
+@router.post("/{entity}", response_model=schemas.ImportReport, dependencies=[Depends(admission("heavy"))])
+def import_records(
+    entity: str,
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Import a CSV (with header) or NDJSON file of ``departments``, ``subjects`` or ``students`` (admin only).
+
+    Subjects and students may give a ``department`` name instead of ``department_id``.
+    Invalid rows are skipped and reported by line; valid rows are committed chunk by chunk.
+    """
+    if entity not in imports.ENTITIES:
+        raise HTTPException(status_code=404, detail=f"Unknown entity; use one of {', '.join(imports.ENTITIES)}")
+    fmt = format or imports.detect_format(file.filename, file.content_type)
+    if fmt not in imports.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format; use one of {', '.join(imports.FORMATS)}")
+    # The import writes through its own connections; don't hold the auth session's.
+    release_session(db)
+    try:
+        return imports.import_file(file.file, entity, fmt)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
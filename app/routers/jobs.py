@@ -0,0 +1,97 @@
+"""Background job routes: submit, poll and download results (admin only)."""
+import json
+import os
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.config import settings
+from app.core import jobs
+from app.core.security import require_role
+from app.database import SessionRoute, get_db
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=SessionRoute)
+
+
+def _to_response(job: models.Job) -> schemas.JobResponse:
+    return schemas.JobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress=job.progress or 0.0,
+        message=job.message,
+        params=json.loads(job.params or "{}"),
+        result=json.loads(job.result) if job.result else None,
+        error=job.error,
+        has_file=bool(job.result_path),
+        created_by=job.created_by,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.get("/kinds")
+def list_job_kinds(current_user: models.User = Depends(require_role("admin"))):
+    """List the job kinds that can be submitted (admin only)."""
+    return sorted(jobs.job_kinds())
+
+
+@router.post("/", response_model=schemas.JobResponse, status_code=202)
+def create_job(
+    job: schemas.JobCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Queue a background job (admin only)."""
+    error = jobs.validate_params(job.kind, job.params)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    return _to_response(jobs.submit(db, job.kind, job.params, current_user.email))
+
+
+@router.get("/", response_model=List[schemas.JobResponse])
+def list_jobs(
+    limit: int = 50,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """List recent jobs, newest first (admin only)."""
+    recent = db.query(models.Job).order_by(models.Job.id.desc()).limit(min(limit, 500)).all()
+    return [_to_response(job) for job in recent]
+
+
+@router.get("/{job_id}", response_model=schemas.JobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Get status and progress of a job (admin only)."""
+    job = db.get(models.Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _to_response(job)
+
+
+@router.get("/{job_id}/result")
+def download_job_result(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Download the file produced by a finished job (admin only)."""
+    job = db.get(models.Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if not job.result_path:
+        raise HTTPException(status_code=404, detail="Job produced no file")
+    path = os.path.realpath(job.result_path)
+    if not path.startswith(os.path.realpath(settings.JOBS_DIR) + os.sep) or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Result file not found")
+    return FileResponse(path, filename=os.path.basename(path))
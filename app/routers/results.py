@@ -1,13 +1,29 @@
 """Result routes."""
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app import models, schemas
-from app.database import get_db
-from app.core.security import get_current_user, require_roles
+from app import models, publications, schemas, transcripts
+from app.config import settings
+from app.database import SessionRoute, get_db
+from app.core import audit
+from app.core.bulk import chunked, upsert
+from app.core.changes import record_changes
+from app.core.expand import fetch, joined, parse_fields, parse_include, shaped
+from app.core.limits import admission
+from app.core.security import get_current_user, require_role, require_roles
 
-router = APIRouter(prefix="/results", tags=["Results"])
+router = APIRouter(prefix="/results", tags=["Results"], route_class=SessionRoute)
+
+INCLUDES = {
+    "student": joined(models.Result.student_rel),
+    "student.department": joined(models.Result.student_rel, models.Student.department_rel),
+    "subject": joined(models.Result.subject_rel),
+    "subject.department": joined(models.Result.subject_rel, models.Subject.department_rel),
+}
 
 
 @router.post("/", response_model=schemas.ResultResponse)
@@ -19,25 +35,190 @@ def create_result(
     """Create a new result (teacher/admin only)."""
     new_result = models.Result(**result.model_dump())
     db.add(new_result)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="A result for this student and subject already exists; use /results/bulk to update it",
+        )
     db.refresh(new_result)
     return new_result
 
 
-@router.get("/", response_model=List[schemas.ResultResponse])
+_KEY = ("student_id", "subject_id")
+_MARKS = ("midterm_marks", "final_marks", "sessional_marks", "total_marks")
+_LOOKUP_CHUNK = 1000
+
+
+def _existing_ids(db: Session, column, ids: Set[int]) -> Set[int]:
+    found: Set[int] = set()
+    for chunk in chunked(sorted(ids), _LOOKUP_CHUNK):
+        found.update(db.execute(select(column).where(column.in_(chunk))).scalars())
+    return found
+
+
+def _row_error(row: dict, students: Set[int], subjects: Set[int]) -> Optional[str]:
+    if row["student_id"] not in students:
+        return "Student not found"
+    if row["subject_id"] not in subjects:
+        return "Subject not found"
+    if any(row[name] < 0 for name in _MARKS):
+        return "Marks cannot be negative"
+    if row["total_marks"] > 100:
+        return "Total marks cannot exceed 100"
+    if row["midterm_marks"] + row["final_marks"] + row["sessional_marks"] != row["total_marks"]:
+        return "Total marks must equal midterm + final + sessional"
+    return None
+
+
+@router.post("/bulk", response_model=schemas.ResultBulkResponse, dependencies=[Depends(admission("heavy"))])
+def bulk_upsert_results(
+    payload: schemas.ResultBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_roles("teacher", "admin"))
+):
+    """Create or update a whole mark sheet in one transaction (teacher/admin only).
+
+    Rows are keyed by (student_id, subject_id), so posting the same sheet
+    again changes nothing. Each row reports created, updated, unchanged or
+    error; with ``atomic`` any error rejects the sheet with 422.
+    """
+    if len(payload.rows) > settings.RESULTS_BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.RESULTS_BULK_MAX_ROWS} rows per request")
+    rows = [row.model_dump() for row in payload.rows]
+    table = models.Result.__table__
+    students = _existing_ids(db, models.Student.id, {row["student_id"] for row in rows})
+    subjects = _existing_ids(db, models.Subject.id, {row["subject_id"] for row in rows})
+    existing: Dict[Tuple[int, int], dict] = {}
+    if students and subjects:
+        for chunk in chunked(sorted(students), _LOOKUP_CHUNK):
+            for found in db.execute(
+                select(table).where(table.c.student_id.in_(chunk), table.c.subject_id.in_(sorted(subjects)))
+            ).mappings():
+                existing[(found["student_id"], found["subject_id"])] = dict(found)
+
+    outcomes: List[schemas.ResultBulkOutcome] = []
+    first_row: Dict[Tuple[int, int], int] = {}
+    writes: List[int] = []
+    diffs: Dict[int, dict] = {}
+    for index, row in enumerate(rows):
+        key = (row["student_id"], row["subject_id"])
+        error = _row_error(row, students, subjects)
+        if error is None and key in first_row:
+            error = f"Duplicate of row {first_row[key]}"
+        first_row.setdefault(key, index)
+        current = existing.get(key)
+        changed = {name: [current[name], row[name]] for name in _MARKS if current[name] != row[name]} if current else {}
+        if error:
+            outcome = schemas.ResultBulkOutcome(row=index, status="error", error=error)
+        elif current and not changed:
+            outcome = schemas.ResultBulkOutcome(row=index, status="unchanged", id=current["id"])
+        else:
+            outcome = schemas.ResultBulkOutcome(row=index, status="updated" if current else "created")
+            writes.append(index)
+            diffs[index] = changed
+        outcomes.append(outcome)
+
+    errors = [{"row": o.row, "error": o.error} for o in outcomes if o.status == "error"]
+    if errors and payload.atomic:
+        raise HTTPException(status_code=422, detail=errors)
+
+    inserted, updated, updated_fields = [], [], []
+    if writes:
+        conn = db.connection()
+        returned = upsert(conn, table, [rows[index] for index in writes], _KEY, ("id",) + _KEY)
+        ids = {(found.student_id, found.subject_id): found.id for found in returned}
+        for index in writes:
+            row = rows[index]
+            row["id"] = outcomes[index].id = ids[(row["student_id"], row["subject_id"])]
+            if outcomes[index].status == "updated":
+                updated.append(row)
+                updated_fields.append({"id": row["id"], **diffs[index]})
+            else:
+                inserted.append(row)
+        record_changes(conn, table.name, "insert", inserted)
+        record_changes(conn, table.name, "update", updated)
+        db.commit()
+        audit.record(current_user.email, "insert", table.name, inserted)
+        audit.record(current_user.email, "update", table.name, updated_fields)
+
+    return schemas.ResultBulkResponse(
+        created=len(inserted),
+        updated=len(updated),
+        unchanged=sum(1 for o in outcomes if o.status == "unchanged"),
+        errors=len(errors),
+        outcomes=outcomes,
+    )
+
+
+@router.post("/publish", dependencies=[Depends(admission("heavy"))])
+def publish_results(
+    department_id: Optional[int] = None,
+    semester: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Freeze cleared students' results and GPA for /students/{id}/results-cleared (admin only).
+
+    Republishing rewrites, and evicts from cache, only documents whose content
+    changed, and withdraws those of students in scope who are no longer cleared.
+    """
+    return publications.publish(db, department_id, semester)
+
+
+@router.get(
+    "/",
+    response_model=List[schemas.ResultExpanded],
+    response_model_exclude_unset=True,
+    dependencies=[Depends(admission("heavy"))],
+)
 def get_results(
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    """Get all results."""
-    return db.query(models.Result).all()
+    """Get all results; ``include`` embeds student/subject (and departments), ``fields`` picks columns."""
+    options = [INCLUDES[name] for name in parse_include(include, INCLUDES)]
+    columns = parse_fields(fields, schemas.ResultExpanded)
+    return shaped(fetch(db, models.Result, columns, options), schemas.ResultExpanded, columns)
 
 
-@router.get("/student/{student_id}", response_model=List[schemas.ResultResponse])
+@router.get(
+    "/student/{student_id}",
+    response_model=List[schemas.ResultExpanded],
+    response_model_exclude_unset=True,
+)
 def get_student_results(
     student_id: int,
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    """Get all results for a specific student."""
-    return db.query(models.Result).filter(models.Result.student_id == student_id).all()
+    """Get all results for a specific student; ``include`` and ``fields`` work as on the list route."""
+    options = [INCLUDES[name] for name in parse_include(include, INCLUDES)]
+    columns = parse_fields(fields, schemas.ResultExpanded)
+    rows = fetch(db, models.Result, columns, options, models.Result.student_id == student_id)
+    return shaped(rows, schemas.ResultExpanded, columns)
+
+
+@router.get("/transcripts", dependencies=[Depends(admission("heavy"))])
+def download_transcripts(
+    department_id: int,
+    semester: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_roles("teacher", "admin"))
+):
+    """Download HTML transcripts for a department cohort as a zip (teacher/admin only)."""
+    cohort = transcripts.load_cohort(db, department_id, semester)
+    if not cohort:
+        raise HTTPException(status_code=404, detail="No students found for this department and semester")
+    filename = f"transcripts_dept{department_id}_sem{semester}.zip"
+    return StreamingResponse(
+        transcripts.stream_transcripts(cohort),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
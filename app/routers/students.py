@@ -1,13 +1,22 @@
 """Student routes: CRUD, GPA, CGPA calculations."""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+import gzip
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app import models, schemas
-from app.database import get_db
-from app.core.security import get_current_user, require_role, calculate_grade_point
+from app import models, publications, rollover, schemas
+from app.database import SessionRoute, get_db
+from app.core.expand import fetch, joined, parse_fields, parse_include, shaped
+from app.core.limits import admission
+from app.core.refdata import reference_data
+from app.core.security import get_current_user, require_role
 
-router = APIRouter(prefix="/students", tags=["Students"])
+router = APIRouter(prefix="/students", tags=["Students"], route_class=SessionRoute)
+
+INCLUDES = {
+    "department": joined(models.Student.department_rel),
+}
 
 
 @router.post("/", response_model=schemas.StudentResponse)
@@ -24,13 +33,44 @@ def create_student(
     return new_student
 
 
-@router.get("/", response_model=List[schemas.StudentResponse])
+@router.get("/", response_model=List[schemas.StudentExpanded], response_model_exclude_unset=True)
 def get_students(
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    """Get all students."""
-    return db.query(models.Student).all()
+    """Get all students; ``include=department`` embeds the department, ``fields`` picks columns."""
+    options = [INCLUDES[name] for name in parse_include(include, INCLUDES)]
+    columns = parse_fields(fields, schemas.StudentExpanded)
+    return shaped(fetch(db, models.Student, columns, options), schemas.StudentExpanded, columns)
+
+
+@router.post("/rollover", response_model=schemas.RolloverResponse)
+def rollover_semester(
+    cohort: schemas.RolloverRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Promote a cohort to the next semester, or with ``dry_run`` just count it (admin only)."""
+    if cohort.dry_run:
+        counts = rollover.preview(db, cohort.department_id, cohort.semester)
+        return schemas.RolloverResponse(
+            dry_run=True, department_id=cohort.department_id, from_semester=cohort.semester, **counts
+        )
+    return rollover.run(db, current_user.email, cohort.department_id, cohort.semester)
+
+
+@router.get("/rollovers", response_model=List[schemas.RolloverResponse])
+def list_rollovers(
+    limit: int = 50,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin"))
+):
+    """Recent semester rollovers, newest first (admin only)."""
+    return db.scalars(
+        select(models.SemesterRollover).order_by(models.SemesterRollover.id.desc()).limit(min(max(limit, 1), 500))
+    ).all()
 
 
 @router.get("/{student_id}", response_model=schemas.StudentResponse)
@@ -46,7 +86,7 @@ def get_student(
     return student
 
 
-@router.get("/{student_id}/gpa/{semester}")
+@router.get("/{student_id}/gpa/{semester}", dependencies=[Depends(admission("heavy"))])
 def calculate_gpa(
     student_id: int,
     semester: int,
@@ -54,33 +94,64 @@ def calculate_gpa(
     current_user: models.User = Depends(get_current_user)
 ):
     """Calculate GPA for a student in a specific semester."""
-    results = db.query(models.Result).join(models.Subject).filter(
-        models.Result.student_id == student_id,
-        models.Subject.semester == semester
+    rows = db.execute(
+        select(models.Student.department_id, models.Result.total_marks)
+        .join(models.Student, models.Student.id == models.Result.student_id)
+        .join(models.Subject, models.Subject.id == models.Result.subject_id)
+        .where(models.Result.student_id == student_id, models.Subject.semester == semester)
     ).all()
 
-    if not results:
+    if not rows:
         raise HTTPException(status_code=404, detail="No results found for this semester")
 
-    total_points = sum(calculate_grade_point(r.total_marks) for r in results)
-    gpa = total_points / len(results)
+    policy = reference_data(db).policy_for(rows[0].department_id)
+    gpa = policy.mean([row.total_marks for row in rows])
     return {"GPA": round(gpa, 2)}
 
 
-@router.get("/{student_id}/cgpa")
+@router.get("/{student_id}/cgpa", dependencies=[Depends(admission("heavy"))])
 def calculate_cgpa(
     student_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
     """Calculate cumulative GPA for a student."""
-    results = db.query(models.Result).filter(
-        models.Result.student_id == student_id
+    rows = db.execute(
+        select(models.Student.department_id, models.Result.total_marks)
+        .join(models.Student, models.Student.id == models.Result.student_id)
+        .where(models.Result.student_id == student_id)
     ).all()
 
-    if not results:
+    if not rows:
         raise HTTPException(status_code=404, detail="No results found")
 
-    total_points = sum(calculate_grade_point(r.total_marks) for r in results)
-    cgpa = total_points / len(results)
+    policy = reference_data(db).policy_for(rows[0].department_id)
+    cgpa = policy.mean([row.total_marks for row in rows])
     return {"CGPA": round(cgpa, 2)}
+
+
+@router.get("/{student_id}/results-cleared")
+def get_published_results(
+    student_id: int,
+    request: Request,
+    semester: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Published results and GPA of a cleared student, one semester or all (see POST /results/publish).
+
+    A single semester is served as the stored gzip document when the client accepts gzip.
+    """
+    if semester is None:
+        body = publications.lookup_all(db, student_id)
+        if body is None:
+            raise HTTPException(status_code=404, detail="No published results for this student")
+        return Response(body, media_type="application/json")
+    payload = publications.lookup(db, student_id, semester)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="No published results for this student and semester")
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            payload, media_type="application/json", headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(gzip.decompress(payload), media_type="application/json", headers={"Vary": "Accept-Encoding"})
@@ -1,13 +1,15 @@
 """Subject routes."""
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app import models, schemas
-from app.database import get_db
+from app.database import SessionRoute, get_db
+from app.core.expand import parse_fields, parse_include, shaped
+from app.core.refdata import reference_data
 from app.core.security import get_current_user, require_role
 
-router = APIRouter(prefix="/subjects", tags=["Subjects"])
+router = APIRouter(prefix="/subjects", tags=["Subjects"], route_class=SessionRoute)
 
 
 @router.post("/", response_model=schemas.SubjectResponse)
@@ -24,13 +26,38 @@ def create_subject(
     return new_subject
 
 
-@router.get("/", response_model=List[schemas.SubjectResponse])
+INCLUDES = ("department",)
+
+
+@router.get("/", response_model=List[schemas.SubjectExpanded], response_model_exclude_unset=True)
 def get_subjects(
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Get all subjects; ``include=department`` embeds the department, ``fields`` picks columns."""
+    snapshot = reference_data(db)
+    columns = parse_fields(fields, schemas.SubjectExpanded)
+    subjects = snapshot.subjects
+    if "department" in parse_include(include, INCLUDES):
+        # Departments come from the same cached snapshot, so expansion costs no queries.
+        subjects = [
+            dict(subject._asdict(), department_rel=snapshot.department(subject.department_id))
+            for subject in subjects
+        ]
+    return shaped(subjects, schemas.SubjectExpanded, columns)
+
+
+@router.get("/department/{department_id}/semester/{semester}", response_model=List[schemas.SubjectResponse])
+def get_subjects_by_department_semester(
+    department_id: int,
+    semester: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    """Get all subjects."""
-    return db.query(models.Subject).all()
+    """Get subjects offered by a department in a semester."""
+    return reference_data(db).subjects_for(department_id, semester)
 
 
 @router.get("/{subject_id}", response_model=schemas.SubjectResponse)
@@ -40,7 +67,7 @@ def get_subject(
     current_user: models.User = Depends(get_current_user)
 ):
     """Get a specific subject by ID."""
-    subject = db.query(models.Subject).filter(models.Subject.id == subject_id).first()
+    subject = reference_data(db).subject(subject_id)
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
     return subject
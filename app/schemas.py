@@ -1,7 +1,31 @@
 """Pydantic schemas for request/response validation."""
-from datetime import date
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, model_validator
+from sqlalchemy import inspect
+
+
+class ExpandableModel(BaseModel):
+    """Serializes ORM relationships only when they were eagerly loaded.
+
+    Unloaded relationships are left unset instead of being lazy-loaded, so
+    routes using ``response_model_exclude_unset`` omit them without N+1 queries.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _loaded_only(cls, obj):
+        if not hasattr(obj, "_sa_instance_state"):
+            return obj
+        state = inspect(obj)
+        unloaded = state.unloaded
+        return {
+            attr.key: state.attrs[attr.key].loaded_value
+            for attr in (*state.mapper.column_attrs, *state.mapper.relationships)
+            if attr.key not in unloaded
+        }
 
 
 # ============== DEPARTMENT ==============
@@ -49,6 +73,27 @@ class ResultResponse(ResultCreate):
         from_attributes = True
 
 
+class ResultBulkRequest(BaseModel):
+    rows: List[ResultCreate] = Field(min_length=1)
+    # Write nothing when any row fails validation.
+    atomic: bool = False
+
+
+class ResultBulkOutcome(BaseModel):
+    row: int
+    status: str  # created, updated, unchanged or error
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ResultBulkResponse(BaseModel):
+    created: int
+    updated: int
+    unchanged: int
+    errors: int
+    outcomes: List[ResultBulkOutcome]
+
+
 # ============== STUDENT ==============
 class StudentCreate(BaseModel):
     name: str
@@ -72,6 +117,36 @@ class StudentResponse(BaseModel):
         from_attributes = True
 
 
+# ============== GRADING ==============
+class GradeBand(BaseModel):
+    min_marks: float = Field(ge=0, le=100)
+    points: float = Field(ge=0)
+
+
+class GradingPolicyCreate(BaseModel):
+    name: str
+    department_id: Optional[int] = None
+    bands: List[GradeBand]
+
+
+class GradingPolicyResponse(GradingPolicyCreate):
+    id: int
+
+
+# ============== EXPANDED (?include=) ==============
+class SubjectExpanded(SubjectResponse, ExpandableModel):
+    department_rel: Optional[DepartmentResponse] = Field(None, serialization_alias="department")
+
+
+class StudentExpanded(StudentResponse, ExpandableModel):
+    department_rel: Optional[DepartmentResponse] = Field(None, serialization_alias="department")
+
+
+class ResultExpanded(ResultResponse, ExpandableModel):
+    student_rel: Optional[StudentExpanded] = Field(None, serialization_alias="student")
+    subject_rel: Optional[SubjectExpanded] = Field(None, serialization_alias="subject")
+
+
 # ============== AUTH ==============
 class UserCreate(BaseModel):
     email: EmailStr
@@ -154,3 +229,73 @@ class UserProfile(BaseModel):
 class PasswordChange(BaseModel):
     current_password: str
     new_password: str
+
+
+# ============== JOBS ==============
+class JobCreate(BaseModel):
+    kind: str
+    params: Dict[str, Any] = {}
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: str
+    progress: float
+    message: Optional[str] = None
+    params: Dict[str, Any] = {}
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    has_file: bool = False
+    created_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class RolloverRequest(BaseModel):
+    # Leave a filter out to promote across every department / semester.
+    department_id: Optional[int] = None
+    semester: Optional[int] = None
+    dry_run: bool = False
+
+
+class RolloverResponse(BaseModel):
+    id: Optional[int] = None
+    dry_run: bool = False
+    actor: Optional[str] = None
+    department_id: Optional[int] = None
+    from_semester: Optional[int] = None
+    promoted: int
+    held_back: int
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    entity: str
+    format: str
+    rows: int
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool
+    seconds: float
+
+
+class AuditEventResponse(BaseModel):
+    id: int
+    occurred_at: datetime
+    actor: Optional[str] = None
+    action: str
+    entity: str
+    entity_id: Optional[int] = None
+    changes: Dict[str, Any] = {}
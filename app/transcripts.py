@@ -0,0 +1,184 @@
+"""Batch transcript rendering streamed as a zip archive.
+
+A cohort (department + semester) is loaded with one query for its students
+and one bulk query for all of their results. Students are rendered to HTML
+in chunks on a spawned process pool, and each finished chunk is deflated
+into the archive and yielded straight to the client, so neither the
+rendered documents nor the archive are ever held in memory as a whole.
+"""
+import multiprocessing
+import threading
+import zipfile
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.core.refdata import reference_data
+from app.core.startup import register_shutdown
+
+
+@lru_cache(maxsize=1)
+def _template():
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    env = Environment(loader=FileSystemLoader("templates"), autoescape=select_autoescape(["html"]))
+    return env.get_template("transcript.html")
+
+
+def render_batch(batch: List[dict]) -> List[tuple]:
+    """Render one chunk of students; runs in a worker process."""
+    template = _template()
+    rendered = []
+    for item in batch:
+        terms = defaultdict(list)
+        point = item["policy"].point
+        for row in item["results"]:
+            row["points"] = point(row["total"])
+            terms[row["semester"]].append(row)
+        term_list = [
+            {
+                "semester": semester,
+                "rows": rows,
+                "gpa": sum(r["points"] for r in rows) / len(rows),
+            }
+            for semester, rows in sorted(terms.items())
+        ]
+        all_rows = [row for term in term_list for row in term["rows"]]
+        cgpa = sum(r["points"] for r in all_rows) / len(all_rows) if all_rows else 0.0
+        html = template.render(
+            app_name=item["app_name"],
+            student=item["student"],
+            department=item["department"],
+            terms=term_list,
+            cgpa=cgpa,
+        )
+        rendered.append((f"{item['student']['roll_no'] or item['student']['id']}.html", html.encode("utf-8")))
+    return rendered
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.TRANSCRIPT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+@register_shutdown
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+class _ZipStream:
+    """Write-only sink for ``zipfile``; buffered bytes are drained by the caller.
+
+    It deliberately has no ``tell``/``seek`` so ``zipfile`` streams entries
+    with data descriptors instead of seeking back to patch headers.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def load_cohort(db: Session, department_id: int, semester: int) -> List[dict]:
+    """Students of a cohort with every result up to ``semester``, in two queries."""
+    snapshot = reference_data(db)
+    department = snapshot.department(department_id)
+    students = db.execute(
+        select(models.Student.id, models.Student.name, models.Student.roll_no, models.Student.semester)
+        .where(models.Student.department_id == department_id, models.Student.semester == semester)
+        .order_by(models.Student.roll_no)
+    ).all()
+    if not students:
+        return []
+
+    results: Dict[int, List[dict]] = defaultdict(list)
+    rows = db.execute(
+        select(
+            models.Result.student_id,
+            models.Subject.name,
+            models.Subject.semester,
+            models.Result.midterm_marks,
+            models.Result.sessional_marks,
+            models.Result.final_marks,
+            models.Result.total_marks,
+        )
+        .join(models.Subject, models.Subject.id == models.Result.subject_id)
+        .join(models.Student, models.Student.id == models.Result.student_id)
+        .where(
+            models.Student.department_id == department_id,
+            models.Student.semester == semester,
+            models.Subject.semester <= semester,
+        )
+        .order_by(models.Result.student_id, models.Subject.semester, models.Subject.name)
+    )
+    for student_id, subject, subject_semester, midterm, sessional, final, total in rows:
+        results[student_id].append({
+            "subject": subject,
+            "semester": subject_semester,
+            "midterm": midterm,
+            "sessional": sessional,
+            "final": final,
+            "total": total,
+        })
+
+    department_name = department.name if department else f"Department {department_id}"
+    policy = snapshot.policy_for(department_id)
+    return [
+        {
+            "app_name": settings.APP_NAME,
+            "student": {"id": s.id, "name": s.name, "roll_no": s.roll_no, "semester": s.semester},
+            "department": department_name,
+            "results": results.get(s.id, []),
+            "policy": policy,
+        }
+        for s in students
+    ]
+
+
+def stream_transcripts(cohort: List[dict]) -> Iterator[bytes]:
+    """Render ``cohort`` on the pool and yield the zip archive chunk by chunk."""
+    size = max(settings.TRANSCRIPT_BATCH_SIZE, 1)
+    batches = deque(cohort[i:i + size] for i in range(0, len(cohort), size))
+    pool = _get_pool()
+    # Keep a bounded window in flight so fast workers cannot outrun the client.
+    window = max(settings.TRANSCRIPT_WORKERS, 1) * 2
+    pending = deque()
+    sink = _ZipStream()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        while batches or pending:
+            while batches and len(pending) < window:
+                pending.append(pool.submit(render_batch, batches.popleft()))
+            for filename, document in pending.popleft().result():
+                archive.writestr(filename, document)
+            yield sink.drain()
+    yield sink.drain()
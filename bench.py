@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""In-process HTTP benchmark for the Student Management System.
+
+Drives the ASGI app through ``httpx.ASGITransport`` against a SQLite
+database (or, with ``--database-url``, e.g. a local PostgreSQL) seeded by
+``seed.py`` per scale tier and reports latency percentiles and throughput
+per endpoint. Results can be stored as a baseline and later runs compared
+against it to catch regressions.
+
+Usage:
+    python bench.py --tier 1k
+    python bench.py --tier 10k --save-baseline
+    python bench.py --tier 10k --compare --tolerance 0.2
+    python bench.py --tier 10k --database-url postgresql://localhost/sms_bench
+    python bench.py --grading          # grading-policy microbenchmark only
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+
+# Seed sizes per tier; results average ~22 per student (semester history x subjects).
+TIERS = {
+    "1k": {"departments": 10, "subjects_per_semester": 5, "students": 1_000},
+    "10k": {"departments": 25, "subjects_per_semester": 5, "students": 10_000},
+    "100k": {"departments": 50, "subjects_per_semester": 5, "students": 100_000},
+}
+
+# (name, path template); templates are filled with ids drawn from the seeded data.
+ENDPOINTS = [
+    ("dashboard", "/dashboard/"),
+    ("students_list", "/students/"),
+    ("student_detail", "/students/{student_id}"),
+    ("student_gpa", "/students/{student_id}/gpa/{semester}"),
+    ("student_cgpa", "/students/{student_id}/cgpa"),
+    ("student_results", "/results/student/{student_id}"),
+    ("departments_list", "/departments/"),
+    ("subjects_list", "/subjects/"),
+]
+
+DEFAULT_BASELINE = "bench_baseline.json"
+BENCH_DIR = Path(".bench")
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def run_endpoint(client, headers, template, ids, requests, concurrency, rng):
+    """Issue ``requests`` GETs with bounded concurrency; return latencies and errors."""
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(template.format(student_id=rng.choice(ids), semester=rng.randint(1, 8)))
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 500:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+async def run_benchmarks(args, sizes) -> dict:
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.main import app
+
+    # seed.py always creates this admin account.
+    headers = {"token": create_access_token({"sub": "admin@example.edu"})}
+
+    rng = random.Random(args.seed)
+    ids = list(range(1, sizes["students"] + 1))
+    selected = [e for e in ENDPOINTS if not args.endpoints or e[0] in args.endpoints]
+    report = {}
+    transport = httpx.ASGITransport(app=app)
+    # ASGITransport does not send lifespan events, so run startup explicitly.
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        for name, template in selected:
+            # Warm caches and connection pool before measuring.
+            await run_endpoint(client, headers, template, ids, args.warmup, 1, rng)
+            latencies, errors, wall = await run_endpoint(
+                client, headers, template, ids, args.requests, args.concurrency, rng
+            )
+            latencies.sort()
+            report[name] = {
+                "requests": len(latencies),
+                "errors": errors,
+                "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+                "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+                "rps": round(len(latencies) / wall, 1) if wall else 0.0,
+            }
+            print(
+                f"{name:<18} p50={report[name]['p50_ms']:>9.2f}ms p95={report[name]['p95_ms']:>9.2f}ms "
+                f"p99={report[name]['p99_ms']:>9.2f}ms rps={report[name]['rps']:>8.1f} errors={errors}"
+            )
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """Return human-readable regressions of p95 latency or throughput beyond tolerance."""
+    regressions = []
+    for name, current in report.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if previous["rps"] and current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {previous['rps']} -> {current['rps']}")
+    return regressions
+
+
+def _legacy_grade_point(total_marks: int) -> float:
+    """The if/elif chain grading used before policies were compiled."""
+    if total_marks >= 85:
+        return 4.0
+    elif total_marks >= 75:
+        return 3.5
+    elif total_marks >= 65:
+        return 3.0
+    elif total_marks >= 55:
+        return 2.5
+    elif total_marks >= 50:
+        return 2.0
+    else:
+        return 0.0
+
+
+def bench_grading(rows: int, seed: int) -> dict:
+    """Time grading ``rows`` marks with the legacy chain and the compiled policy."""
+    from app.core.grading import DEFAULT_POLICY
+
+    rng = random.Random(seed)
+    marks = [min(100, max(0, int(rng.gauss(62, 15)))) for _ in range(rows)]
+    counts = {}
+    for m in marks:
+        counts[m] = counts.get(m, 0) + 1
+
+    cases = {
+        "legacy_chain": lambda: sum(_legacy_grade_point(m) for m in marks),
+        "policy_point": lambda: sum(DEFAULT_POLICY.point(m) for m in marks),
+        "policy_total": lambda: DEFAULT_POLICY.total(marks),
+        "policy_weighted": lambda: DEFAULT_POLICY.weighted_total(counts),
+    }
+    expected = cases["legacy_chain"]()
+    report = {}
+    for name, func in cases.items():
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            value = func()
+            timings.append(time.perf_counter() - start)
+        assert abs(value - expected) < 1e-6, f"{name} disagrees with the legacy chain"
+        report[name] = round(min(timings) * 1000, 3)
+    base = report["legacy_chain"]
+    for name, ms in report.items():
+        print(f"{name:<16} {ms:>9.3f}ms  x{base / ms if ms else float('inf'):.1f}")
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tier", choices=sorted(TIERS), default="1k")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--endpoints", nargs="*", help="subset of endpoint names to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="benchmark this database instead of the tier's SQLite file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--grading", action="store_true", help="run the grading microbenchmark and exit")
+    parser.add_argument("--grading-rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if args.grading:
+        bench_grading(args.grading_rows, args.seed)
+        return 0
+
+    sizes = TIERS[args.tier]
+    BENCH_DIR.mkdir(exist_ok=True)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        db_path = BENCH_DIR / f"bench_{args.tier}.db"
+        # Settings are read at import time, so point the app at the tier database first.
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from sqlalchemy import func, select
+
+    from app import models
+    from app.core.startup import ensure_schema
+    from app.database import Base, engine
+
+    ensure_schema(engine, Base.metadata)
+    with engine.connect() as conn:
+        fresh = not conn.execute(select(func.count()).select_from(models.Student)).scalar()
+    if fresh:
+        from seed import SeedConfig, generate
+
+        start = time.perf_counter()
+        counts = generate(engine, SeedConfig(seed=args.seed, **sizes))
+        print(f"Seeded tier {args.tier} ({counts['results']:,} results) in {time.perf_counter() - start:.1f}s")
+
+    report = asyncio.run(run_benchmarks(args, sizes))
+
+    baseline_path = Path(args.baseline)
+    baselines = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    status = 0
+    if args.compare:
+        if args.tier not in baselines:
+            print(f"No baseline for tier {args.tier} in {baseline_path}")
+        else:
+            regressions = compare(report, baselines[args.tier], args.tolerance)
+            for line in regressions:
+                print(f"REGRESSION {line}")
+            status = 1 if regressions else 0
+    if args.save_baseline:
+        baselines[args.tier] = report
+        baseline_path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Saved baseline for tier {args.tier} to {baseline_path}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,7 @@ from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 import models
+from app.core.grading import DEFAULT_POLICY
 from database import SessionLocal
 
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-change-in-production")
@@ -24,18 +25,7 @@ def get_db():
         db.close()
 
 def calculate_grade_point(marks: int):
-    if marks >= 85:
-        return 4.0
-    elif marks >= 75:
-        return 3.5
-    elif marks >= 65:
-        return 3.0
-    elif marks >= 55:
-        return 2.5
-    elif marks >= 50:
-        return 2.0
-    else:
-        return 0.0
+    return DEFAULT_POLICY.point(marks)
 
 
 
@@ -6,6 +6,7 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 import models, schemas
+from app.core.startup import ensure_schema
 from database import engine
 from ext import (
     get_db,
@@ -18,15 +19,19 @@ from ext import (
     calculate_grade_point,
 )
 
-# Create tables on startup (for simple deployments / demos).
-models.Base.metadata.create_all(engine)
-
 app = FastAPI(
     title="Student Management System",
     description="Production-ready FastAPI backend for managing students, departments, subjects, results, fees, and clearance.",
     version="1.0.0",
 )
 
+
+# Create tables on startup (for simple deployments / demos); DDL is skipped
+# when the stored schema fingerprint already matches.
+@app.on_event("startup")
+def create_tables() -> None:
+    ensure_schema(engine, models.Base.metadata, name="legacy")
+
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
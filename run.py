@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Entry point for running the Student Management System."""
+"""Development entry point with auto-reload; use serve.py in production."""
 import uvicorn
 
 
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Production entry point: a supervised pool of uvicorn worker processes.
+
+The parent binds the listening socket once and hands it to ``WORKERS``
+spawned children. Workers exit after serving ``MAX_REQUESTS`` (plus a
+per-worker jitter so they do not all recycle together) and are replaced
+immediately, which bounds memory growth. A worker that exits before it
+finished starting up (each one signals readiness once its lifespan startup
+ran and it is listening) is replaced after an exponential backoff, and
+after ``WORKER_MAX_FAILURES`` such failed starts in a row the supervisor
+stops and exits non-zero instead of crash-looping. SIGTERM/SIGINT stop
+respawning and let every worker drain in-flight requests for up to
+``GRACEFUL_TIMEOUT`` seconds before it is killed. Schema DDL runs once in
+the supervisor before any worker starts, so workers never race to create
+tables on a fresh database. All knobs come from ``app.config.Settings``.
+
+Use ``run.py`` for local development with auto-reload.
+"""
+import importlib.util
+import logging
+import os
+import random
+import signal
+import sys
+import time
+
+import uvicorn
+from uvicorn._subprocess import get_subprocess, spawn
+
+from app.config import settings
+
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _pick(preferred: str, fallback: str) -> str:
+    """Use an optional accelerated implementation when it is installed."""
+    return preferred if importlib.util.find_spec(preferred) else fallback
+
+
+def build_config() -> uvicorn.Config:
+    """Build a worker config; each call draws a fresh max-requests jitter."""
+    limit = None
+    if settings.MAX_REQUESTS > 0:
+        limit = settings.MAX_REQUESTS + random.randint(0, max(settings.MAX_REQUESTS_JITTER, 0))
+    return uvicorn.Config(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        loop=_pick("uvloop", "asyncio"),
+        http=_pick("httptools", "h11"),
+        backlog=settings.BACKLOG,
+        timeout_keep_alive=settings.KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT,
+        limit_concurrency=settings.LIMIT_CONCURRENCY or None,
+        limit_max_requests=limit,
+        proxy_headers=True,
+        access_log=settings.ACCESS_LOG,
+    )
+
+
+def prepare_schema() -> None:
+    """Apply SCHEMA_MODE here, then tell the workers to skip it."""
+    if settings.SCHEMA_MODE != "never":
+        from app import models  # noqa: F401  registers the tables on Base.metadata
+        from app.core.startup import ensure_schema
+        from app.database import Base, engine
+
+        ran_ddl = ensure_schema(engine, Base.metadata, force=settings.SCHEMA_MODE == "always")
+        engine.dispose()
+        logger.info("Schema %s", "created/updated" if ran_ddl else "up to date, DDL skipped")
+    # Spawned workers read their settings from the environment.
+    os.environ["SCHEMA_MODE"] = "never"
+
+
+class WorkerServer(uvicorn.Server):
+    """A uvicorn server that sets ``ready`` once startup completed."""
+
+    def __init__(self, config: uvicorn.Config, ready):
+        super().__init__(config=config)
+        self.ready = ready
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        if self.started:
+            self.ready.set()
+
+
+class Supervisor:
+    """Keeps ``workers`` processes alive until asked to stop or they keep failing."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.should_exit = False
+        self.exit_code = 0
+        # Per slot: the process (None while waiting to respawn), its readiness
+        # event, its start time, consecutive failed starts and when the
+        # replacement is due.
+        self.processes = []
+        self.ready = [None] * workers
+        self.started = [0.0] * workers
+        self.failures = [0] * workers
+        self.respawn_at = [0.0] * workers
+        self.config = build_config()
+        self.socket = self.config.bind_socket()
+
+    def spawn(self, index: int):
+        config = build_config()
+        self.ready[index] = spawn.Event()
+        server = WorkerServer(config, self.ready[index])
+        process = get_subprocess(config=config, target=server.run, sockets=[self.socket])
+        process.start()
+        self.started[index] = time.monotonic()
+        return process
+
+    def handle_signal(self, sig, frame) -> None:
+        self.should_exit = True
+
+    def run(self) -> int:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self.handle_signal)
+
+        logger.info(
+            "Supervisor %s starting %d workers on %s:%d (loop=%s, http=%s)",
+            os.getpid(), self.workers, settings.HOST, settings.PORT, self.config.loop, self.config.http,
+        )
+        self.processes = [self.spawn(index) for index in range(self.workers)]
+        while not self.should_exit:
+            for index, process in enumerate(self.processes):
+                if self.should_exit:
+                    break
+                if process is None:
+                    if time.monotonic() >= self.respawn_at[index]:
+                        self.processes[index] = self.spawn(index)
+                elif not process.is_alive():
+                    process.join()
+                    self.replace(index, process)
+            time.sleep(0.5)
+        self.drain()
+        return self.exit_code
+
+    def replace(self, index: int, process) -> None:
+        """Schedule a replacement for an exited worker, backing off after failed starts."""
+        uptime = time.monotonic() - self.started[index]
+        # A worker that got ready and later exited (a MAX_REQUESTS recycle) resets the count.
+        self.failures[index] = 0 if self.ready[index].is_set() else self.failures[index] + 1
+        failures = self.failures[index]
+        if failures >= settings.WORKER_MAX_FAILURES:
+            logger.error(
+                "Worker %s exited with code %s after %.1fs, %d failed starts in a row; giving up",
+                process.pid, process.exitcode, uptime, failures,
+            )
+            self.should_exit = True
+            self.exit_code = 1
+            return
+        delay = 0.0
+        if failures:
+            delay = min(settings.WORKER_RESPAWN_BACKOFF * 2 ** (failures - 1), settings.WORKER_RESPAWN_BACKOFF_MAX)
+        logger.info(
+            "Worker %s exited with code %s after %.1fs; starting a replacement in %.1fs",
+            process.pid, process.exitcode, uptime, delay,
+        )
+        self.processes[index] = None
+        self.respawn_at[index] = time.monotonic() + delay
+
+    def drain(self) -> None:
+        """Ask every worker to finish in-flight requests, then kill stragglers."""
+        self.processes = [process for process in self.processes if process is not None]
+        logger.info("Draining %d workers", len(self.processes))
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + settings.GRACEFUL_TIMEOUT + 5
+        for process in self.processes:
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.warning("Worker %s did not drain in time; killing", process.pid)
+                process.kill()
+                process.join()
+        self.socket.close()
+
+
+def main() -> int:
+    workers = settings.WORKERS or os.cpu_count() or 1
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+    prepare_schema()
+    return Supervisor(workers).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())